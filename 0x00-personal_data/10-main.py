@@ -0,0 +1,17 @@
+#!/usr/bin/env python3
+"""
+Main file
+"""
+import bcrypt
+
+verify_many = __import__('encrypt_password').verify_many
+
+passwords = ["password{}".format(i) for i in range(200)]
+hashes = [bcrypt.hashpw(p.encode(), bcrypt.gensalt(4)) for p in passwords]
+candidates = [p if i % 3 else "breached" for i, p in enumerate(passwords)]
+
+report = {}
+results = verify_many(zip(hashes, candidates), report=report)
+valid = sum(ok for _, ok in results)
+print("{} valid out of {}".format(valid, report["checked"]))
+print("{:.0f} checks/sec".format(report["per_second"]))
@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+Main file
+"""
+import io
+import logging
+import subprocess
+import sys
+import time
+
+get_logger = __import__('filtered_logger').get_logger
+
+
+class SlowStream(io.StringIO):
+    """Stream taking a millisecond per write, slower than the callers"""
+
+    def write(self, text):
+        time.sleep(0.001)
+        return super().write(text)
+
+
+def run(block, count=2000):
+    """Logs count records through a 10 records queue to a slow stream"""
+    logger = logging.getLogger("user_data")
+    logger.handlers = []
+    logger = get_logger(async_mode=True, queue_size=10, block=block)
+    handler = logger.handlers[0]
+    stream = SlowStream()
+    handler.listener.handlers[0].setStream(stream)
+    for i in range(count):
+        logger.info("name=bob; password={};".format(i))
+    handler.close()
+    return len(stream.getvalue().splitlines()), handler.dropped
+
+
+for block in (False, True):
+    written, dropped = run(block)
+    print("block={}: {} written, {} dropped".format(block, written, dropped))
+
+# A malformed record is reported and skipped, the listener keeps going;
+# the records queued at exit are flushed and the process exits
+script = """
+import logging
+logging.raiseExceptions = False
+logger = __import__('filtered_logger').get_logger(async_mode=True)
+logger.info("bad %s %s", "x")
+for i in range(20000):
+    logger.info("name=bob; password=%s;", i)
+"""
+result = subprocess.run(
+    [sys.executable, "-c", script], capture_output=True, text=True,
+    timeout=30
+)
+print("exit {}: {} records flushed at exit".format(
+    result.returncode, len(result.stderr.splitlines())))
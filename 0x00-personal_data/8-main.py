@@ -0,0 +1,26 @@
+#!/usr/bin/env python3
+"""
+Main file
+"""
+import sqlite3
+
+ConnectionPool = __import__('filtered_logger').ConnectionPool
+
+pool = ConnectionPool(
+    lambda: sqlite3.connect(":memory:", check_same_thread=False), size=2
+)
+
+with pool.connection() as db:
+    cursor = db.cursor()
+    cursor.execute("SELECT 1")
+    print(cursor.fetchone()[0])
+    first = db
+
+with pool.connection() as db:
+    print(db is first)
+
+first.close()
+with pool.connection() as db:
+    print(db is first)
+
+pool.close()
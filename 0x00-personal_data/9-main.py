@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+"""
+Main file
+"""
+import io
+import logging
+import sys
+import time
+
+filtered_logger = __import__('filtered_logger')
+RedactingFormatter = filtered_logger.RedactingFormatter
+PII_FIELDS = filtered_logger.PII_FIELDS
+
+
+class MutatingFormatter(RedactingFormatter):
+    """
+    Previous RedactingFormatter: rewrites record.msg on every format,
+    which also breaks records logged with args on a second handler
+    """
+
+    def format(self, record):
+        record.msg = self.redactor.redact(record.getMessage())
+        return logging.Formatter.format(self, record)
+
+
+def run(formatter_class, count):
+    """Logs count records to 3 handlers sharing the formatter class"""
+    logger = logging.getLogger("user_data")
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+    logger.handlers = []
+    for _ in range(3):
+        handler = logging.StreamHandler(io.StringIO())
+        handler.setFormatter(formatter_class(list(PII_FIELDS)))
+        logger.addHandler(handler)
+    start = time.perf_counter()
+    for i in range(count):
+        logger.info(
+            "name=bob; email=bob@dylan.com; phone=555-0100; "
+            "ssn=000-00-0000; password={}; ip=10.0.0.1;".format(i))
+    return time.perf_counter() - start
+
+
+count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+mutating = run(MutatingFormatter, count)
+print("redact per handler: {:.2f}s".format(mutating))
+cached = run(RedactingFormatter, count)
+print("redact per record:  {:.2f}s".format(cached))
+print("speedup:            {:.1f}x".format(mutating / cached))
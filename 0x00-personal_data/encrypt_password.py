@@ -2,25 +2,173 @@
 """
 Password Encryption Module
 """
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from itertools import islice
+from typing import Callable, Iterable, Iterator, List, Tuple
+import os
+import time
 import bcrypt
 
 
+# Latency budget of one hash targeted by calibrate_cost, in milliseconds
+TARGET_MS = 250
+
+# Runs of a cost, the fastest one counting, before calibrate_cost
+# rejects it as over budget
+CALIBRATION_SAMPLES = 3
+
+# Bounds of the bcrypt cost (log2 of the key expansion rounds)
+MIN_ROUNDS = 4
+MAX_ROUNDS = 31
+
+# (hash, password) pairs checked per task by verify_many
+VERIFY_CHUNK = 32
+
+# Cost used by hash_password, bcrypt's own default until calibrated
+_rounds = 12
+
+
+def get_cost() -> int:
+    """
+    Returns the bcrypt cost used by hash_password
+    """
+    return _rounds
+
+
+def set_cost(rounds: int) -> None:
+    """
+    Sets the bcrypt cost used by hash_password
+    """
+    global _rounds
+    if not MIN_ROUNDS <= rounds <= MAX_ROUNDS:
+        raise ValueError(
+            f"cost must be between {MIN_ROUNDS} and {MAX_ROUNDS}")
+    _rounds = rounds
+
+
+def calibrate_cost(target_ms: float = TARGET_MS) -> int:
+    """
+    Measures bcrypt on this machine and sets the cost used by
+    hash_password to the highest one hashing within target_ms.
+    Costs are timed from the lowest up to the first one over budget. A
+    cost is rejected only when all its CALIBRATION_SAMPLES runs are over
+    budget, so one run slowed down by the machine cannot lower the cost.
+    Every extra round doubles the time: the accepted costs take up to
+    about twice the target, the rejected one up to CALIBRATION_SAMPLES
+    times twice the target, so calibrating takes at most about 8 times
+    the target.
+    """
+    rounds = MIN_ROUNDS
+    while rounds < MAX_ROUNDS:
+        salt = bcrypt.gensalt(rounds + 1)
+        for _ in range(CALIBRATION_SAMPLES):
+            start = time.perf_counter()
+            bcrypt.hashpw(b"calibration", salt)
+            if (time.perf_counter() - start) * 1000 <= target_ms:
+                break
+        else:
+            break
+        rounds += 1
+    set_cost(rounds)
+    return rounds
+
+
+def hash_cost(hashed_password: bytes) -> int:
+    """
+    Returns the cost a bcrypt hash was computed with
+    """
+    return int(hashed_password.split(b"$")[2])
+
+
+def needs_rehash(hashed_password: bytes) -> bool:
+    """
+    Checks if a hash was computed with a lower cost than the current one
+    """
+    return hash_cost(hashed_password) < _rounds
+
+
 def hash_password(password: str) -> bytes:
     """
     Encrypts/Hashes the password
     """
     encoded = password.encode()
-    hashed = bcrypt.hashpw(encoded, bcrypt.gensalt())
+    hashed = bcrypt.hashpw(encoded, bcrypt.gensalt(_rounds))
 
     return hashed
 
 
-def is_valid(hashed_password: bytes, password: str) -> bool:
+def is_valid(
+    hashed_password: bytes,
+    password: str,
+    rehash: Callable[[bytes], None] = None,
+) -> bool:
     """
     Validates if the password matches the hashed password.
+    When it does and the hash uses an outdated cost, rehash is called
+    with a new hash of the password so the caller can store it.
     """
     valid = False
     encoded = password.encode()
     if bcrypt.checkpw(encoded, hashed_password):
         valid = True
+        if rehash is not None and needs_rehash(hashed_password):
+            rehash(hash_password(password))
     return valid
+
+
+def _check_chunk(pairs: List[Tuple[bytes, str]]) -> List[bool]:
+    """
+    Checks a chunk of (hashed_password, password) pairs in a worker
+    """
+    results = []
+    for hashed_password, password in pairs:
+        try:
+            results.append(bcrypt.checkpw(password.encode(), hashed_password))
+        except ValueError:
+            results.append(False)
+    return results
+
+
+def verify_many(
+    pairs: Iterable[Tuple[bytes, str]],
+    workers: int = None,
+    chunk_size: int = VERIFY_CHUNK,
+    report: dict = None,
+) -> Iterator[Tuple[int, bool]]:
+    """
+    Validates (hashed_password, password) pairs in parallel across
+    processes, yielding (index, valid) as chunks finish, so results
+    come out of order. Malformed hashes are reported as not valid.
+    Pairs are read lazily with a bounded number of chunks in flight.
+    If given, report is kept updated with the pairs checked, the
+    elapsed seconds and the pairs checked per second.
+    """
+    workers = workers or os.cpu_count() or 1
+    pairs = iter(pairs)
+    if report is None:
+        report = {}
+    report.update(checked=0, seconds=0.0, per_second=0.0)
+    start = time.perf_counter()
+    with ProcessPoolExecutor(workers) as pool:
+        pending = {}
+        offset = 0
+        exhausted = False
+        while pending or not exhausted:
+            while not exhausted and len(pending) < 2 * workers:
+                chunk = list(islice(pairs, chunk_size))
+                if not chunk:
+                    exhausted = True
+                    break
+                pending[pool.submit(_check_chunk, chunk)] = offset
+                offset += len(chunk)
+            if not pending:
+                break
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                first = pending.pop(future)
+                results = future.result()
+                report["checked"] += len(results)
+                report["seconds"] = time.perf_counter() - start
+                report["per_second"] = report["checked"] / report["seconds"]
+                for i, valid in enumerate(results):
+                    yield first + i, valid
@@ -1,9 +1,22 @@
 #!/usr/bin/env python3
 """Logger Module for Filtering User Personal Data"""
 
-from typing import List
+from typing import Any, Callable, Iterator, List, Pattern, Tuple
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from functools import lru_cache, partial
+from queue import Empty, Full, LifoQueue, Queue
+import argparse
+import atexit
+import mmap
+import os
 import re
 import logging
+import logging.handlers
+import threading
+import time
+import traceback
 from os import environ
 import mysql.connector
 
@@ -11,6 +24,60 @@ import mysql.connector
 # PII fields to be redacted
 PII_FIELDS = ("name", "email", "phone", "ssn", "password")
 
+# Rows fetched, redacted and written together by the export
+BATCH_SIZE = 1000
+
+# Bytes of log file redacted per task by the scrub command
+CHUNK_SIZE = 8 * 1024 * 1024
+
+# Records held by the asynchronous logger before the queue is full
+QUEUE_SIZE = 10000
+
+# Connections handed out at once by the pool returned by get_pool
+POOL_SIZE = 5
+
+
+@lru_cache(maxsize=128)
+def _compile_fields(fields: Tuple[str, ...], separator: str) -> Pattern:
+    """
+    Compiles the fields to redact into a single alternation pattern,
+    cached by (fields, separator).
+    """
+    names = "|".join(re.escape(f) for f in fields)
+    return re.compile(f"({names})=.*?{re.escape(separator)}")
+
+
+class Redactor:
+    """
+    Redaction engine redacting every field of a message in one pass
+    """
+
+    def __init__(self, fields: List[str], redaction: str, separator: str):
+        """
+        Constructor method for Redactor class
+        """
+        self.fields = tuple(fields)
+        self.redaction = redaction
+        self.separator = separator
+        self.key = (self.fields, redaction, separator)
+        self.pattern = _compile_fields(self.fields, separator)
+        self._redacted = {f: f"{f}={redaction}{separator}" for f in fields}
+
+    def redact(self, message: str) -> str:
+        """
+        Returns the message with the value of each field redacted.
+        Splitting on the pattern keeps the captured field names at odd
+        indexes, which are swapped for their redacted form.
+        """
+        if not self.fields:
+            return message
+        parts = self.pattern.split(message)
+        if len(parts) == 1:
+            return message
+        redacted = self._redacted
+        parts[1::2] = [redacted[f] for f in parts[1::2]]
+        return "".join(parts)
+
 
 def filter_datum(
     fields: List[str], redaction: str, message: str, separator: str
@@ -19,17 +86,17 @@ def filter_datum(
     Replaces sensitive information in a message with a redacted value
     based on the list of fields to redact.
     """
-    for f in fields:
-        message = re.sub(
-            f"{f}=.*?{separator}",
-            f"{f}={redaction}{separator}",
-            message)
-    return message
+    return Redactor(fields, redaction, separator).redact(message)
 
 
-def get_logger() -> logging.Logger:
+def get_logger(
+    async_mode: bool = False, queue_size: int = QUEUE_SIZE, block: bool = False
+) -> logging.Logger:
     """
-    Returns a Logger object for handling Personal Data
+    Returns a Logger object for handling Personal Data.
+    In async mode the calling thread only enqueues the raw record; a
+    listener thread redacts and writes records in batches. When the
+    queue is full, records are dropped unless block is True.
     """
     logger = logging.getLogger("user_data")
     logger.setLevel(logging.INFO)
@@ -37,29 +104,117 @@ def get_logger() -> logging.Logger:
 
     stream_handler = logging.StreamHandler()
     stream_handler.setFormatter(RedactingFormatter(list(PII_FIELDS)))
-    logger.addHandler(stream_handler)
+    if not async_mode:
+        logger.addHandler(stream_handler)
+        return logger
+
+    records = Queue(queue_size)
+    listener = BatchQueueListener(records, [stream_handler])
+    listener.start()
+    atexit.register(listener.stop)
+    logger.addHandler(RawQueueHandler(records, listener, block))
 
     return logger
 
 
+def _db_config() -> dict:
+    """
+    Returns the connection settings of the Personal Data database
+    """
+    return {
+        "user": environ.get("PERSONAL_DATA_DB_USERNAME", "root"),
+        "password": environ.get("PERSONAL_DATA_DB_PASSWORD", ""),
+        "host": environ.get("PERSONAL_DATA_DB_HOST", "localhost"),
+        "database": environ.get("PERSONAL_DATA_DB_NAME"),
+    }
+
+
 def get_db() -> mysql.connector.connection.MySQLConnection:
     """
     Returns a MySQLConnection object for accessing Personal Data database
     """
-    username = environ.get("PERSONAL_DATA_DB_USERNAME", "root")
-    password = environ.get("PERSONAL_DATA_DB_PASSWORD", "")
-    host = environ.get("PERSONAL_DATA_DB_HOST", "localhost")
-    db_name = environ.get("PERSONAL_DATA_DB_NAME")
-
-    cnx = mysql.connector.connection.MySQLConnection(
-        user=username, password=password, host=host, database=db_name
-    )
+    cnx = mysql.connector.connection.MySQLConnection(**_db_config())
     return cnx
 
 
-def main():
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_pool(size: int = POOL_SIZE) -> "ConnectionPool":
+    """
+    Returns the shared ConnectionPool of the Personal Data database,
+    created with the given size on first call
+    """
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ConnectionPool(size=size)
+        return _pool
+
+
+def emit_batch(
+    handlers: List[logging.Handler], records: List[logging.LogRecord]
+):
     """
-    Main function to retrieve user data from database and log to console
+    Writes a batch of records to every handler, with a single write and
+    flush per stream handler.
+    Like Handler.emit, a record that fails to format or write is passed
+    to handler.handleError and the others are still written.
+    """
+    for handler in handlers:
+        if not isinstance(handler, logging.StreamHandler):
+            for record in records:
+                handler.handle(record)
+            continue
+        accepted = [
+            r for r in records
+            if r.levelno >= handler.level and handler.filter(r)
+        ]
+        if not accepted:
+            continue
+        handler.acquire()
+        try:
+            text = _format_batch(handler, accepted)
+            if text is None:
+                continue
+            try:
+                handler.stream.write(text + handler.terminator)
+                handler.flush()
+            except Exception:
+                handler.handleError(accepted[0])
+        finally:
+            handler.release()
+
+
+def _format_batch(
+    handler: logging.Handler, records: List[logging.LogRecord]
+) -> str:
+    """
+    Formats records as newline separated text, one record at a time
+    when the batch fails to format, so a malformed record only loses
+    itself. Returns None if no record could be formatted.
+    """
+    formatter = handler.formatter
+    if isinstance(formatter, RedactingFormatter):
+        try:
+            return formatter.format_batch(records)
+        except Exception:
+            pass
+    lines = []
+    for record in records:
+        try:
+            lines.append(handler.format(record))
+        except Exception:
+            handler.handleError(record)
+    return "\n".join(lines) if lines else None
+
+
+def export_users(batch_size: int = BATCH_SIZE):
+    """
+    Retrieves user data from database and logs it to console.
+    Rows are streamed from the server in batches so memory use does not
+    grow with the size of the table.
     """
     db = get_db()
     cursor = db.cursor()
@@ -68,13 +223,140 @@ def main():
 
     logger = get_logger()
 
-    for row in cursor:
-        str_row = "".join(f"{f}={str(r)}; " for r, f in zip(row, field_names))
-        logger.info(str_row.strip())
+    rows = 0
+    start = time.perf_counter()
+    batch = cursor.fetchmany(batch_size)
+    while batch:
+        records = [
+            logger.makeRecord(
+                logger.name, logging.INFO, __file__, 0,
+                "; ".join(f"{f}={r}" for r, f in zip(row, field_names)) + ";",
+                None, None)
+            for row in batch
+        ]
+        emit_batch(logger.handlers, records)
+        rows += len(batch)
+        batch = cursor.fetchmany(batch_size)
+    elapsed = time.perf_counter() - start
 
     cursor.close()
     db.close()
 
+    rate = rows / elapsed if elapsed else 0
+    print(f"{rows} rows in {elapsed:.2f}s ({rate:.0f} rows/sec)")
+
+
+def _chunk_bounds(
+    data: mmap.mmap, chunk_size: int
+) -> List[Tuple[int, int]]:
+    """
+    Splits the mapped file into (start, end) ranges of about chunk_size
+    bytes, each ending right after a newline.
+    """
+    bounds = []
+    size = len(data)
+    start = 0
+    while start < size:
+        end = min(start + chunk_size, size)
+        if end < size:
+            newline = data.find(b"\n", end - 1)
+            end = size if newline == -1 else newline + 1
+        bounds.append((start, end))
+        start = end
+    return bounds
+
+
+def _scrub_chunk(
+    path: str, start: int, end: int, fields: Tuple[str, ...]
+) -> bytes:
+    """
+    Returns the redacted bytes of one chunk of the log file
+    """
+    with open(path, "rb") as f:
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            text = data[start:end].decode("utf-8", "surrogateescape")
+    redactor = Redactor(
+        fields, RedactingFormatter.REDACTION, RedactingFormatter.SEPARATOR
+    )
+    return redactor.redact(text).encode("utf-8", "surrogateescape")
+
+
+def scrub_file(
+    input_path: str,
+    output_path: str,
+    fields: Tuple[str, ...] = PII_FIELDS,
+    workers: int = None,
+    chunk_size: int = CHUNK_SIZE,
+) -> int:
+    """
+    Redacts an existing log file with the same rules as
+    RedactingFormatter. Newline aligned chunks are redacted across a
+    process pool and written to output_path in their original order.
+    Returns the number of bytes read.
+    """
+    size = os.path.getsize(input_path)
+    if size == 0:
+        open(output_path, "wb").close()
+        return 0
+    with open(input_path, "rb") as f:
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            bounds = _chunk_bounds(data, chunk_size)
+
+    workers = workers or os.cpu_count() or 1
+    window = 2 * workers
+    with ProcessPoolExecutor(workers) as pool:
+        pending = deque()
+        with open(output_path, "wb") as out:
+            for start, end in bounds:
+                pending.append(pool.submit(
+                    _scrub_chunk, input_path, start, end, tuple(fields)))
+                if len(pending) >= window:
+                    out.write(pending.popleft().result())
+            while pending:
+                out.write(pending.popleft().result())
+    return size
+
+
+def main(argv: List[str] = None):
+    """
+    Main function: exports the users table to the console, or redacts an
+    existing log file with the scrub command.
+    """
+    parser = argparse.ArgumentParser(description="Personal data logger")
+    parser.add_argument(
+        "--batch-size", type=int, default=BATCH_SIZE,
+        help="rows fetched and written per batch")
+    commands = parser.add_subparsers(dest="command")
+    scrub = commands.add_parser("scrub", help="redact an existing log file")
+    scrub.add_argument("input", help="log file to redact")
+    scrub.add_argument("output", help="file the redacted log is written to")
+    scrub.add_argument(
+        "--workers", type=int, default=None,
+        help="worker processes (defaults to the number of CPUs)")
+    scrub.add_argument(
+        "--chunk-size", type=int, default=CHUNK_SIZE,
+        help="bytes redacted per task")
+    scrub.add_argument(
+        "--fields", default=",".join(PII_FIELDS),
+        help="comma separated fields to redact")
+    args = parser.parse_args(argv)
+
+    if args.command == "scrub":
+        if args.chunk_size < 1:
+            parser.error("--chunk-size must be a positive integer")
+        fields = tuple(f for f in args.fields.split(",") if f)
+        start = time.perf_counter()
+        size = scrub_file(
+            args.input, args.output, fields, args.workers, args.chunk_size)
+        elapsed = time.perf_counter() - start
+        rate = size / elapsed if elapsed else 0
+        print(f"{size} bytes in {elapsed:.2f}s ({rate:.0f} bytes/sec)")
+        return
+
+    if args.batch_size < 1:
+        parser.error("--batch-size must be a positive integer")
+    export_users(args.batch_size)
+
 
 class RedactingFormatter(logging.Formatter):
     """
@@ -91,16 +373,287 @@ class RedactingFormatter(logging.Formatter):
         """
         super(RedactingFormatter, self).__init__(self.FORMAT)
         self.fields = fields
+        self.redactor = Redactor(fields, self.REDACTION, self.SEPARATOR)
 
     def format(self, record: logging.LogRecord) -> str:
         """
         Formats the specified log record as text.
-        Filters values in incoming log records using filter_datum.
+        Filters values in incoming log records using the redactor,
+        leaving record.msg and record.args untouched.
+        """
+        cache = self._redaction_cache(record)
+        key = self.redactor.key
+        if key not in cache:
+            cache[key] = self.redactor.redact(record.getMessage())
+        return self._format_redacted(record, cache[key])
+
+    def format_batch(self, records: List[logging.LogRecord]) -> str:
         """
-        record.msg = filter_datum(
-            self.fields, self.REDACTION, record.getMessage(), self.SEPARATOR
+        Formats a batch of log records as newline separated text.
+        Messages not redacted yet are redacted together in a single pass.
+        """
+        key = self.redactor.key
+        pending = [r for r in records if key not in self._redaction_cache(r)]
+        if pending:
+            messages = [record.getMessage() for record in pending]
+            redacted = self.redactor.redact("\n".join(messages)).split("\n")
+            if len(redacted) != len(pending):
+                redacted = [self.redactor.redact(m) for m in messages]
+            for record, message in zip(pending, redacted):
+                record.redacted[key] = message
+        return "\n".join(
+            self._format_redacted(r, r.redacted[key]) for r in records
         )
-        return super(RedactingFormatter, self).format(record)
+
+    @staticmethod
+    def _redaction_cache(record: logging.LogRecord) -> dict:
+        """
+        Returns the redacted messages stored on the record, keyed by
+        redaction rules, so handlers sharing a record redact it once
+        """
+        cache = record.__dict__.get("redacted")
+        if cache is None:
+            cache = record.redacted = {}
+        return cache
+
+    def _format_redacted(self, record: logging.LogRecord, message: str) -> str:
+        """
+        Same as logging.Formatter.format with an already redacted message
+        """
+        record.message = message
+        if self.usesTime():
+            record.asctime = self.formatTime(record, self.datefmt)
+        s = self.formatMessage(record)
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            if s[-1:] != "\n":
+                s = s + "\n"
+            s = s + record.exc_text
+        if record.stack_info:
+            if s[-1:] != "\n":
+                s = s + "\n"
+            s = s + self.formatStack(record.stack_info)
+        return s
+
+
+class ConnectionPool:
+    """
+    Pool of reusable database connections.
+    By default connections are MySQLConnection objects built from the
+    environment read once; any DB-API factory (e.g. sqlite3.connect) can
+    be given instead.
+    """
+
+    def __init__(
+        self,
+        factory: Callable[[], Any] = None,
+        size: int = POOL_SIZE,
+        timeout: float = None,
+    ):
+        """
+        Constructor method for ConnectionPool class
+        """
+        if size < 1:
+            raise ValueError("size must be a positive integer")
+        if factory is None:
+            factory = partial(
+                mysql.connector.connection.MySQLConnection, **_db_config()
+            )
+        self.factory = factory
+        self.size = size
+        self.timeout = timeout
+        self._idle = LifoQueue(size)
+        self._slots = threading.BoundedSemaphore(size)
+
+    @staticmethod
+    def is_alive(cnx: Any) -> bool:
+        """
+        Returns True if the connection still answers a trivial query
+        """
+        try:
+            cursor = cnx.cursor()
+            try:
+                cursor.execute("SELECT 1")
+                cursor.fetchall()
+            finally:
+                cursor.close()
+            return True
+        except Exception:
+            return False
+
+    @staticmethod
+    def _discard(cnx: Any):
+        """
+        Closes a connection that is leaving the pool
+        """
+        try:
+            cnx.close()
+        except Exception:
+            pass
+
+    def _checkout(self) -> Any:
+        """
+        Returns a live idle connection, replacing dead ones,
+        or a new connection when none is idle
+        """
+        while True:
+            try:
+                cnx = self._idle.get_nowait()
+            except Empty:
+                return self.factory()
+            if self.is_alive(cnx):
+                return cnx
+            self._discard(cnx)
+
+    def _checkin(self, cnx: Any):
+        """
+        Returns a connection to the pool, rolling back what the caller
+        left uncommitted, so the next borrower never inherits an open
+        transaction and its snapshot; a connection that cannot roll
+        back is discarded
+        """
+        try:
+            cnx.rollback()
+        except Exception:
+            self._discard(cnx)
+            return
+        try:
+            self._idle.put_nowait(cnx)
+        except Full:
+            self._discard(cnx)
+
+    @contextmanager
+    def connection(self) -> Iterator[Any]:
+        """
+        Checks a validated connection out of the pool for the duration
+        of the with block. Waits up to timeout seconds for a free slot.
+        """
+        if not self._slots.acquire(timeout=self.timeout):
+            raise TimeoutError("no database connection available")
+        try:
+            cnx = self._checkout()
+        except BaseException:
+            self._slots.release()
+            raise
+        try:
+            yield cnx
+        finally:
+            self._checkin(cnx)
+            self._slots.release()
+
+    def close(self):
+        """
+        Closes every idle connection of the pool
+        """
+        while True:
+            try:
+                self._discard(self._idle.get_nowait())
+            except Empty:
+                return
+
+
+class RawQueueHandler(logging.handlers.QueueHandler):
+    """
+    Queue handler enqueueing raw records, leaving redaction and
+    formatting to its listener thread
+    """
+
+    def __init__(
+        self, queue: Queue, listener: "BatchQueueListener", block: bool
+    ):
+        """
+        Constructor method for RawQueueHandler class
+        """
+        super(RawQueueHandler, self).__init__(queue)
+        self.listener = listener
+        self.block = block
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        """
+        Returns the record untouched, it never leaves the process
+        """
+        return record
+
+    def enqueue(self, record: logging.LogRecord):
+        """
+        Enqueues the record, blocking or dropping it when the queue is full
+        """
+        try:
+            self.queue.put(record, block=self.block)
+        except Full:
+            self.dropped += 1
+
+    def close(self):
+        """
+        Stops the listener once the queued records are written
+        """
+        self.listener.stop()
+        super(RawQueueHandler, self).close()
+
+
+class BatchQueueListener(threading.Thread):
+    """
+    Listener thread writing queued records to its handlers in batches
+    """
+
+    BATCH_SIZE = 500
+    # Seconds stop() waits for room in the queue for its sentinel
+    STOP_TIMEOUT = 5
+
+    def __init__(self, queue: Queue, handlers: List[logging.Handler]):
+        """
+        Constructor method for BatchQueueListener class
+        """
+        super(BatchQueueListener, self).__init__(daemon=True)
+        self.queue = queue
+        self.handlers = handlers
+        self._sentinel = object()
+        self._stopped = False
+        self._lock = threading.Lock()
+
+    def run(self):
+        """
+        Waits for a record, then drains what else is queued into the
+        same batch, until stop() is called
+        """
+        running = True
+        while running:
+            batch = [self.queue.get()]
+            while len(batch) < self.BATCH_SIZE:
+                try:
+                    batch.append(self.queue.get_nowait())
+                except Empty:
+                    break
+            if self._sentinel in batch:
+                running = False
+                batch = [r for r in batch if r is not self._sentinel]
+            if batch:
+                try:
+                    emit_batch(self.handlers, batch)
+                except Exception:
+                    if logging.raiseExceptions:
+                        traceback.print_exc()
+
+    def stop(self):
+        """
+        Flushes the queued records and stops the listener. Does not wait
+        for a listener that is no longer running or draining the queue.
+        """
+        with self._lock:
+            if self._stopped:
+                return
+            self._stopped = True
+        if self.is_alive():
+            try:
+                self.queue.put(self._sentinel, timeout=self.STOP_TIMEOUT)
+            except Full:
+                pass
+            else:
+                self.join()
+        for handler in self.handlers:
+            handler.flush()
 
 
 if __name__ == "__main__":
@@ -4,16 +4,77 @@
 from api.v1.views import app_views
 from flask import abort, jsonify, request
 from models.user import User
+import base64
+import json
+
+
+# Users per page when no limit is given, and the largest limit accepted
+USERS_PAGE_SIZE = 100
+USERS_PAGE_MAX = 1000
+
+
+def _encode_cursor(user: User) -> str:
+    """Opaque cursor of the page starting after a user"""
+    key = json.dumps(list(user.page_key()), separators=(",", ":"))
+    return base64.urlsafe_b64encode(key.encode()).decode()
+
+
+def _decode_cursor(cursor: str) -> tuple:
+    """Page key of a cursor, None if it is not a valid cursor"""
+    try:
+        key = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+    except ValueError:
+        return None
+    if type(key) is not list or len(key) != 2 or \
+            not all(type(k) is str for k in key):
+        return None
+    return tuple(key)
 
 
 @app_views.route("/users", methods=["GET"], strict_slashes=False)
 def view_all_users() -> str:
     """GET /api/v1/users
+    Query parameters (optional):
+      - fields: comma separated attributes to return
+      - limit: number of User objects per page, enables pagination
+      - cursor: next_cursor of the previous page, enables pagination
     Return:
-      - list of all User objects JSON represented
+      - list of all User objects JSON represented, without pagination
+      - with pagination, a page of User objects in (created_at, id)
+        order and the next_cursor to get the next page, null after
+        the last one
+      - 400 if a parameter is invalid
     """
-    all_users = [user.to_json() for user in User.all()]
-    return jsonify(all_users)
+    fields = request.args.get("fields")
+    if fields is not None:
+        fields = [field for field in fields.split(",") if field]
+        if not fields:
+            return jsonify({"error": "fields missing"}), 400
+    if "limit" not in request.args and "cursor" not in request.args:
+        all_users = [user.to_json(fields=fields) for user in User.all()]
+        return jsonify(all_users)
+
+    try:
+        limit = int(request.args.get("limit", USERS_PAGE_SIZE))
+    except ValueError:
+        limit = 0
+    if not 0 < limit <= USERS_PAGE_MAX:
+        return jsonify({"error": "limit must be between 1 and {}"
+                        .format(USERS_PAGE_MAX)}), 400
+    after = None
+    if request.args.get("cursor"):
+        after = _decode_cursor(request.args.get("cursor"))
+        if after is None:
+            return jsonify({"error": "Wrong cursor"}), 400
+    users = User.page(after, limit + 1)
+    next_cursor = None
+    if len(users) > limit:
+        users = users[:limit]
+        next_cursor = _encode_cursor(users[-1])
+    return jsonify({
+        "users": [user.to_json(fields=fields) for user in users],
+        "next_cursor": next_cursor,
+    })
 
 
 @app_views.route("/users/<user_id>", methods=["GET"], strict_slashes=False)
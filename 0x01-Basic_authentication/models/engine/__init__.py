@@ -0,0 +1,26 @@
+#!/usr/bin/env python3
+""" Storage engines of the models
+"""
+from importlib import import_module
+
+
+# Storage engines by name: module, class and options of the engine.
+# Modules are only imported when their engine is selected.
+ENGINES = {
+    "file": ("models.engine.file_storage", "FileStorage", {}),
+    "journal": (
+        "models.engine.file_storage", "FileStorage", {"journal": True}
+    ),
+    "shared": (
+        "models.engine.file_storage", "FileStorage", {"shared": True}
+    ),
+    "sqlite": ("models.engine.sqlite_storage", "SQLiteStorage", {}),
+}
+
+
+def load_engine(name: str):
+    """Create the storage engine registered under name"""
+    if name not in ENGINES:
+        raise ValueError("Unknown storage engine: {}".format(name))
+    module, class_name, options = ENGINES[name]
+    return getattr(import_module(module), class_name)(**options)
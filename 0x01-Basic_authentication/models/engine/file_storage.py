@@ -0,0 +1,506 @@
+#!/usr/bin/env python3
+""" FileStorage module
+"""
+from bisect import bisect_left, bisect_right, insort
+from contextlib import contextmanager
+from typing import TypeVar, List, Iterator, Tuple
+from os import getenv, path
+import fcntl
+import json
+import os
+import tempfile
+from models.engine.storage import Storage
+
+
+# Journal records written before the journal is compacted, at least as
+# many as there are objects so compaction stays O(1) amortized per write
+JOURNAL_COMPACT_EVERY = int(getenv("MODELS_JOURNAL_COMPACT_EVERY", 1000))
+# When writes reach the disk: "always" fsyncs files and journal appends,
+# "snapshot" only fsyncs files, "never" leaves it to the OS. Files are
+# replaced atomically whatever the policy.
+FSYNC = getenv("MODELS_FSYNC", "snapshot")
+
+
+def _atomic_write(file_path: str, content: str):
+    """Replace a file with new content without ever exposing a partial
+    file: the content goes to a temporary file renamed over the old one"""
+    directory = path.dirname(path.abspath(file_path))
+    fd, tmp_path = tempfile.mkstemp(
+        dir=directory, prefix=path.basename(file_path), suffix=".tmp"
+    )
+    try:
+        mode = os.stat(file_path).st_mode if path.exists(file_path) else 0o644
+        os.chmod(tmp_path, mode & 0o777)
+        with os.fdopen(fd, "w") as f:
+            f.write(content)
+            if FSYNC != "never":
+                f.flush()
+                os.fsync(f.fileno())
+        os.replace(tmp_path, file_path)
+    except BaseException:
+        if path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    if FSYNC != "never" and hasattr(os, "O_DIRECTORY"):
+        dir_fd = os.open(directory, os.O_RDONLY | os.O_DIRECTORY)
+        try:
+            os.fsync(dir_fd)
+        finally:
+            os.close(dir_fd)
+
+
+class FileStorage(Storage):
+    """Keeps the objects in memory, persisted in .db_<Class>.json
+
+    Without journal, the file is rewritten on every write. With journal,
+    each write is appended to .db_<Class>.journal, compacted into the
+    file from time to time.
+
+    Shared storage lets several processes use the same files: writes
+    are journaled under an exclusive lock of .db_<Class>.lock, and
+    before every read or write the objects are brought up to date with
+    the journal records appended by the other processes since.
+    """
+
+    def __init__(self, journal: bool = False, shared: bool = False):
+        """Initialize a FileStorage instance"""
+        super().__init__()
+        self.journal = journal or shared
+        self.shared = shared
+        # Objects, or their JSON dictionaries until first used:
+        # data[class][object id] -> object
+        self.data = {}
+        # Records in the journal of each class since the last compaction
+        self.journal_sizes = {}
+        # Hash indexes: indexes[class][attribute][value] -> {id: None}
+        self.indexes = {}
+        # Indexed values of each object: indexed_values[class][id] -> tuple
+        self.indexed_values = {}
+        # Sorted page keys, built by the first page() of the class:
+        # orders[class] -> [(created_at, id)], order_keys[class][id] -> key
+        self.orders = {}
+        self.order_keys = {}
+        # Files last read by shared storage: generations[class] ->
+        # (file identity, journal inode, journal offset)
+        self.generations = {}
+
+    def register(self, cls: type):
+        """Make the class known to the engine"""
+        if self.data.get(cls.__name__) is None:
+            self.data[cls.__name__] = {}
+
+    @staticmethod
+    def _file_path(cls: type) -> str:
+        """Path of the file of the class"""
+        return ".db_{}.json".format(cls.__name__)
+
+    @staticmethod
+    def _journal_path(cls: type) -> str:
+        """Path of the journal of the class"""
+        return ".db_{}.journal".format(cls.__name__)
+
+    @contextmanager
+    def _locked(self, cls: type, exclusive: bool = True) -> Iterator[None]:
+        """Hold the lock of the class files, shared storage only"""
+        if not self.shared:
+            yield
+            return
+        with open(".db_{}.lock".format(cls.__name__), "a") as f:
+            fcntl.flock(f, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+            try:
+                yield
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+    @staticmethod
+    def _stat(file_path: str) -> tuple:
+        """Identity of a file, changed whenever it is replaced, None if
+        there is no file"""
+        try:
+            st = os.stat(file_path)
+        except FileNotFoundError:
+            return None
+        return st.st_ino, st.st_mtime_ns, st.st_size
+
+    def load(self, cls: type):
+        """Load all objects from file, then replay the journal
+
+        Objects are kept as their JSON dictionaries until they are first
+        returned by get() or search().
+        """
+        with self._lock, self._locked(cls, exclusive=False):
+            self._load(cls)
+
+    def _load(self, cls: type):
+        """Load all objects, lock held"""
+        s_class = cls.__name__
+        file_path = self._file_path(cls)
+        generation = self._stat(file_path)
+        journal = self._stat(self._journal_path(cls))
+        self.data[s_class] = {}
+        if path.exists(file_path):
+            with open(file_path, "r") as f:
+                self.data[s_class] = json.loads(f.read())
+        count, offset = self._replay_journal(cls)
+        self.journal_sizes[s_class] = count
+        self.generations[s_class] = (
+            generation, journal and journal[0], offset
+        )
+        self._reindex(cls)
+
+    def refresh(self, cls: type):
+        """Bring the objects up to date with the files: nothing to do when
+        they did not change, the new journal records are applied when
+        only the journal grew, everything is loaded otherwise"""
+        if self._changed(cls):
+            with self._lock, self._locked(cls, exclusive=False):
+                self._catch_up(cls)
+
+    def _sync(self, cls: type):
+        """Apply the writes of the other processes, shared storage only"""
+        if self.shared:
+            self.refresh(cls)
+
+    def _changed(self, cls: type) -> bool:
+        """Check if the files changed since they were last read"""
+        state = self.generations.get(cls.__name__)
+        if state is None:
+            return True
+        generation, journal_ino, offset = state
+        if self._stat(self._file_path(cls)) != generation:
+            return True
+        journal = self._stat(self._journal_path(cls))
+        if journal is None:
+            return journal_ino is not None
+        return journal[0] != journal_ino or journal[2] != offset
+
+    def _catch_up(self, cls: type):
+        """Apply what changed in the files, lock held"""
+        if not self._changed(cls):
+            return
+        s_class = cls.__name__
+        state = self.generations.get(s_class)
+        journal = self._stat(self._journal_path(cls))
+        if state is None or journal is None or \
+                self._stat(self._file_path(cls)) != state[0] or \
+                state[1] not in (None, journal[0]) or journal[2] < state[2]:
+            self._load(cls)
+            return
+        touched = {}
+        count, offset = self._replay_journal(cls, state[2], touched)
+        self.journal_sizes[s_class] = \
+            self.journal_sizes.get(s_class, 0) + count
+        self.generations[s_class] = (state[0], journal[0], offset)
+        objs = self.data[s_class]
+        for obj_id in touched:
+            self._unindex(cls, obj_id)
+            if obj_id in objs:
+                self._index(cls, obj_id, objs[obj_id])
+
+    def _object(self, cls: type, obj_id: str) -> TypeVar("Base"):  # noqa
+        """Return one object by ID, building it from its JSON dictionary
+        if it was not used since it was loaded"""
+        objs = self.data[cls.__name__]
+        obj = objs.get(obj_id)
+        if type(obj) is dict:
+            obj = objs[obj_id] = cls(**obj)
+        return obj
+
+    def save_all(self, cls: type):
+        """Save all objects to file
+
+        The journal is emptied, as the file now holds all of its writes.
+        """
+        with self._lock, self._locked(cls):
+            if self.shared:
+                self._catch_up(cls)
+            self._save_all(cls)
+
+    def _save_all(self, cls: type):
+        """Save all objects to file, lock held"""
+        s_class = cls.__name__
+        file_path = self._file_path(cls)
+        objs_json = {}
+        for obj_id, obj in self.data[s_class].items():
+            if type(obj) is dict:
+                objs_json[obj_id] = obj
+            else:
+                objs_json[obj_id] = obj.to_json(True)
+
+        _atomic_write(file_path, json.dumps(objs_json))
+        if self.shared:
+            _atomic_write(self._journal_path(cls), "")
+        elif self.journal_sizes.get(s_class):
+            open(self._journal_path(cls), "w").close()
+        self.journal_sizes[s_class] = 0
+        journal = self._stat(self._journal_path(cls))
+        self.generations[s_class] = (
+            self._stat(file_path), journal and journal[0], 0
+        )
+
+    def _replay_journal(
+        self, cls: type, offset: int = 0, touched: dict = None
+    ) -> Tuple[int, int]:
+        """Apply the journal records from offset to the loaded objects,
+        adding the IDs of the objects written to touched
+
+        A last record cut short by a crash is dropped from the journal,
+        or left to the next writer in shared storage, as a process may
+        still be writing it.
+        Returns the number of records replayed and the offset reached.
+        """
+        objs = self.data[cls.__name__]
+        journal_path = self._journal_path(cls)
+        if not path.exists(journal_path):
+            return 0, offset
+        count = 0
+        with open(journal_path, "rb" if self.shared else "rb+") as f:
+            f.seek(offset)
+            for line in f:
+                try:
+                    if not line.endswith(b"\n"):
+                        raise ValueError("incomplete record")
+                    record = json.loads(line)
+                except ValueError:
+                    if not self.shared:
+                        f.truncate(offset)
+                    break
+                if record["op"] == "save":
+                    obj_json = record["obj"]
+                    obj_id = obj_json["id"]
+                    objs[obj_id] = obj_json
+                elif record["op"] == "remove":
+                    obj_id = record["id"]
+                    objs.pop(obj_id, None)
+                if touched is not None:
+                    touched[obj_id] = None
+                offset += len(line)
+                count += 1
+        return count, offset
+
+    def _write(self, cls: type, writes: List[tuple]):
+        """Append (op, object) writes to the journal, or rewrite the
+        file without journal"""
+        with self._lock:
+            if not self.journal:
+                self._save_all(cls)
+                return
+            with self._locked(cls):
+                self._append(cls, writes)
+
+    def _append(self, cls: type, writes: List[tuple]):
+        """Append writes to the journal, lock held
+
+        Shared storage first catches up with the other processes, then
+        applies the writes again over what it read.
+        """
+        s_class = cls.__name__
+        if self.shared:
+            self._catch_up(cls)
+            objs = self.data[s_class]
+            for op, obj in writes:
+                self._unindex(cls, obj.id)
+                if op == "save":
+                    objs[obj.id] = obj
+                    self._index(cls, obj.id, obj)
+                else:
+                    objs.pop(obj.id, None)
+        records = []
+        for op, obj in writes:
+            if op == "save":
+                record = {"op": op, "obj": obj.to_json(True)}
+            else:
+                record = {"op": op, "id": obj.id}
+            records.append(json.dumps(record) + "\n")
+        with open(self._journal_path(cls), "a") as f:
+            if self.shared:
+                f.truncate(self.generations[s_class][2])
+            f.write("".join(records))
+            if FSYNC == "always":
+                f.flush()
+                os.fsync(f.fileno())
+            offset = f.tell()
+        state = self.generations.get(s_class)
+        if state is not None:
+            journal_ino = state[1] or self._stat(self._journal_path(cls))[0]
+            self.generations[s_class] = (state[0], journal_ino, offset)
+        size = self.journal_sizes.get(s_class, 0) + len(records)
+        self.journal_sizes[s_class] = size
+        if size >= max(JOURNAL_COMPACT_EVERY, len(self.data[s_class])):
+            self._save_all(cls)
+
+    def save(self, obj: TypeVar("Base")):  # type: ignore
+        """Save an object"""
+        cls = obj.__class__
+        with self._lock:
+            self.data[cls.__name__][obj.id] = obj
+            self._unindex(cls, obj.id)
+            self._index(cls, obj.id, obj)
+        self._persist(cls, "save", obj)
+
+    def remove(self, obj: TypeVar("Base")):  # type: ignore
+        """Remove an object"""
+        cls = obj.__class__
+        with self._lock:
+            self._sync(cls)
+            objs = self.data[cls.__name__]
+            if objs.pop(obj.id, None) is None:
+                return
+            self._unindex(cls, obj.id)
+        self._persist(cls, "remove", obj)
+
+    def _reindex(self, cls: type):
+        """Rebuild the indexes of the class from all objects"""
+        s_class = cls.__name__
+        attrs = cls.INDEXED_ATTRIBUTES
+        self.indexes[s_class] = {attr: {} for attr in attrs}
+        self.indexed_values[s_class] = {}
+        self.orders.pop(s_class, None)
+        self.order_keys.pop(s_class, None)
+        if not attrs:
+            return
+        indexes = [self.indexes[s_class][attr] for attr in attrs]
+        indexed_values = self.indexed_values[s_class]
+        for obj_id, obj in self.data[s_class].items():
+            if type(obj) is dict:
+                values = tuple(map(obj.get, attrs))
+            else:
+                values = tuple(getattr(obj, a, None) for a in attrs)
+            indexed_values[obj_id] = values
+            for index, value in zip(indexes, values):
+                ids = index.get(value)
+                if ids is None:
+                    index[value] = {obj_id: None}
+                else:
+                    ids[obj_id] = None
+
+    def _index(self, cls: type, obj_id: str, obj):
+        """Add an object, or its JSON dictionary, to the indexes"""
+        order_keys = self.order_keys.get(cls.__name__)
+        if order_keys is not None:
+            key = order_keys[obj_id] = self._page_key(obj_id, obj)
+            insort(self.orders[cls.__name__], key)
+        attrs = cls.INDEXED_ATTRIBUTES
+        if not attrs:
+            return
+        if cls.__name__ not in self.indexes:
+            self._reindex(cls)
+            return
+        if type(obj) is dict:
+            values = tuple(map(obj.get, attrs))
+        else:
+            values = tuple(getattr(obj, a, None) for a in attrs)
+        indexes = self.indexes[cls.__name__]
+        for attr, value in zip(attrs, values):
+            indexes[attr].setdefault(value, {})[obj_id] = None
+        self.indexed_values[cls.__name__][obj_id] = values
+
+    def _unindex(self, cls: type, obj_id: str):
+        """Remove an object from the indexes"""
+        s_class = cls.__name__
+        key = self.order_keys.get(s_class, {}).pop(obj_id, None)
+        if key is not None:
+            keys = self.orders[s_class]
+            del keys[bisect_left(keys, key)]
+        values = self.indexed_values.get(s_class, {}).pop(obj_id, None)
+        if values is None:
+            return
+        indexes = self.indexes[s_class]
+        for attr, value in zip(cls.INDEXED_ATTRIBUTES, values):
+            ids = indexes[attr].get(value)
+            if ids is not None:
+                ids.pop(obj_id, None)
+                if not ids:
+                    del indexes[attr][value]
+
+    @staticmethod
+    def _page_key(obj_id: str, obj) -> tuple:
+        """Page key of an object, or of its JSON dictionary"""
+        if type(obj) is dict:
+            return obj.get("created_at") or "", obj_id
+        return obj.page_key()
+
+    def _order(self, cls: type) -> list:
+        """Sorted page keys of the class, built on first use then kept
+        up to date by _index() and _unindex()"""
+        s_class = cls.__name__
+        keys = self.orders.get(s_class)
+        if keys is None:
+            order_keys = {
+                obj_id: self._page_key(obj_id, obj)
+                for obj_id, obj in self.data[s_class].items()
+            }
+            keys = sorted(order_keys.values())
+            self.order_keys[s_class] = order_keys
+            self.orders[s_class] = keys
+        return keys
+
+    def count(self, cls: type) -> int:
+        """Count all objects of the class"""
+        with self._lock:
+            self._sync(cls)
+            return len(self.data[cls.__name__])
+
+    def get(self, cls: type, id: str) -> TypeVar("Base"):  # type: ignore
+        """Return one object by ID"""
+        with self._lock:
+            self._sync(cls)
+            return self._object(cls, id)
+
+    def search(
+        self, cls: type, attributes: dict = {}
+    ) -> List[TypeVar("Base")]:  # type: ignore
+        """Search all objects with matching attributes
+
+        Objects are looked up in a hash index when an attribute is
+        indexed, scanned otherwise.
+        """
+        with self._lock:
+            return self._search(cls, attributes)
+
+    def _search(
+        self, cls: type, attributes: dict
+    ) -> List[TypeVar("Base")]:  # type: ignore
+        """Search all objects with matching attributes, lock held"""
+        self._sync(cls)
+        s_class = cls.__name__
+        objs = self.data[s_class]
+
+        def _search(obj):
+            if len(attributes) == 0:
+                return True
+            for k, v in attributes.items():
+                if getattr(obj, k) != v:
+                    return False
+            return True
+
+        def _object(obj_id):
+            return self._object(cls, obj_id)
+
+        indexes = self.indexes.get(s_class, {})
+        for k, v in attributes.items():
+            if k in indexes:
+                try:
+                    ids = indexes[k].get(v, {})
+                except TypeError:
+                    break
+                return list(filter(_search, map(_object, list(ids))))
+        return list(filter(_search, map(_object, list(objs))))
+
+    def page(
+        self, cls: type, after: tuple = None, limit: int = 100
+    ) -> List[TypeVar("Base")]:  # type: ignore
+        """Return at most limit objects in page_key() order, after the
+        object of key after
+
+        The page starts with a binary search in the sorted keys, so its
+        cost does not depend on the number of objects before it.
+        """
+        with self._lock:
+            self._sync(cls)
+            keys = self._order(cls)
+            start = bisect_right(keys, tuple(after)) if after else 0
+            return [
+                self._object(cls, obj_id)
+                for _, obj_id in keys[start:start + limit]
+            ]
@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+""" Storage module
+"""
+from contextlib import contextmanager
+from typing import TypeVar, List, Iterable, Iterator
+import threading
+
+
+class Storage:
+    """Interface of the storage engines, with the write batching they
+    share: engines persist writes in _write(), called right away or
+    once per class when the batch is flushed
+
+    Engines hold _lock while they change or serialize their objects, as
+    the flusher thread of a batch writes concurrently with the others.
+    It is never held while calling _persist(), which may flush a batch.
+    """
+
+    def __init__(self):
+        """Initialize a Storage instance"""
+        # Batch of the thread in a batch_writes() block, per thread so
+        # the writes of the other threads are not deferred
+        self._local = threading.local()
+        self._lock = threading.RLock()
+
+    def register(self, cls: type):
+        """Make the class known to the engine"""
+
+    def load(self, cls: type):
+        """Load all objects of the class"""
+        raise NotImplementedError
+
+    def refresh(self, cls: type):
+        """Bring the objects of the class up to date with the storage"""
+        self.load(cls)
+
+    def save_all(self, cls: type):
+        """Persist all objects of the class"""
+        raise NotImplementedError
+
+    def save(self, obj: TypeVar("Base")):  # type: ignore
+        """Save an object"""
+        raise NotImplementedError
+
+    def remove(self, obj: TypeVar("Base")):  # type: ignore
+        """Remove an object"""
+        raise NotImplementedError
+
+    def count(self, cls: type) -> int:
+        """Count all objects of the class"""
+        raise NotImplementedError
+
+    def get(self, cls: type, id: str) -> TypeVar("Base"):  # type: ignore
+        """Return one object by ID"""
+        raise NotImplementedError
+
+    def search(
+        self, cls: type, attributes: dict = {}
+    ) -> List[TypeVar("Base")]:  # type: ignore
+        """Search all objects with matching attributes"""
+        raise NotImplementedError
+
+    def all(self, cls: type) -> Iterable[TypeVar("Base")]:  # type: ignore
+        """Return all objects of the class"""
+        return self.search(cls)
+
+    def page(
+        self, cls: type, after: tuple = None, limit: int = 100
+    ) -> List[TypeVar("Base")]:  # type: ignore
+        """Return at most limit objects of the class in page_key() order,
+        starting after the object of key after, from the start if None"""
+        raise NotImplementedError
+
+    def _write(self, cls: type, writes: List[tuple]):
+        """Persist (op, object) writes of the class"""
+        raise NotImplementedError
+
+    def _persist(self, cls: type, op: str, obj: TypeVar("Base")):  # noqa
+        """Persist one write, deferred while writes are batched"""
+        batch = getattr(self._local, "batch", None)
+        if batch is not None and batch.add(cls, (op, obj)):
+            return
+        self._write(cls, [(op, obj)])
+
+    @contextmanager
+    def batch_writes(
+        self, flush_every: int = 0, interval: float = 0
+    ) -> Iterator["WriteBatch"]:
+        """Defer the persistence of writes until the end of the block,
+        see models.base.batch_writes
+
+        Only the writes of the calling thread are deferred.
+        """
+        local = self._local
+        if getattr(local, "batch", None) is not None:
+            yield local.batch
+            return
+        batch = local.batch = WriteBatch(self, flush_every, interval)
+        try:
+            yield batch
+        finally:
+            local.batch = None
+            batch.close()
+
+
+class WriteBatch:
+    """Writes deferred by batch_writes, grouped by class"""
+
+    def __init__(
+        self, storage: Storage, flush_every: int = 0, interval: float = 0
+    ):
+        """Initialize a WriteBatch instance"""
+        self.storage = storage
+        self.flush_every = flush_every
+        self.interval = interval
+        self.pending = {}
+        self.writes = 0
+        self._lock = threading.RLock()
+        self._stop = threading.Event()
+        self._flusher = None
+        if interval:
+            self._flusher = threading.Thread(target=self._run, daemon=True)
+            self._flusher.start()
+
+    def add(self, cls: type, write: tuple) -> bool:
+        """Defer a write, flushing every flush_every writes
+
+        Returns False if the batch is closed and the write must be done
+        right away.
+        """
+        with self._lock:
+            if self._stop.is_set():
+                return False
+            self.pending.setdefault(cls, []).append(write)
+            self.writes += 1
+            if self.flush_every and self.writes >= self.flush_every:
+                self.flush()
+            return True
+
+    def flush(self):
+        """Persist the deferred writes, once per class"""
+        with self._lock:
+            pending, self.pending = self.pending, {}
+            self.writes = 0
+            for cls, writes in pending.items():
+                self.storage._write(cls, writes)
+
+    def _run(self):
+        """Flush every interval seconds until closed"""
+        while not self._stop.wait(self.interval):
+            self.flush()
+
+    def close(self):
+        """Stop the background flusher and persist what is left"""
+        with self._lock:
+            self._stop.set()
+            self.flush()
+        if self._flusher is not None:
+            self._flusher.join()
@@ -3,36 +3,28 @@
 Route module for the API
 """
 from os import getenv
+from api.v1.auth.registry import load_auth
 from api.v1.views import app_views
 from flask import Flask, jsonify, abort, request
 from flask_cors import CORS, cross_origin
-import os
 
 
 app = Flask(__name__)
 app.register_blueprint(app_views)
 CORS(app, resources={r"/api/v1/*": {"origins": "*"}})
-auth = None
-if os.getenv("AUTH_TYPE") == "auth":
-    from api.v1.auth.auth import Auth
+# Paths that do not require authentication
+EXCLUDED_PATHS = (
+    "/api/v1/status/",
+    "/api/v1/unauthorized/",
+    "/api/v1/forbidden/",
+    "/api/v1/auth_session/login/",
+)
 
-    auth = Auth()
-elif os.getenv("AUTH_TYPE") == "basic_auth":
-    from api.v1.auth.basic_auth import BasicAuth
-
-    auth = BasicAuth()
-elif os.getenv("AUTH_TYPE") == "session_auth":
-    from api.v1.auth.session_auth import SessionAuth
-
-    auth = SessionAuth()
-elif os.getenv("AUTH_TYPE") == "session_exp_auth":
-    from api.v1.auth.session_exp_auth import SessionExpAuth
-
-    auth = SessionExpAuth()
-elif os.getenv("AUTH_TYPE") == "session_db_auth":
-    from api.v1.auth.session_db_auth import SessionDBAuth
-
-    auth = SessionDBAuth()
+# Strategies selected by AUTH_TYPE, comma separated to chain them;
+# views read them from app.extensions rather than importing this module,
+# which runs as __main__ when started with python3 -m api.v1.app
+auth = load_auth(getenv("AUTH_TYPE"))
+app.extensions["auth"] = auth
 
 
 @app.before_request
@@ -40,21 +32,13 @@ def authentication():
     """Perform authentication checks before handling each request."""
     if auth:
         request.current_user = auth.current_user(request)
-        if auth.require_auth(
-            request.path,
-            [
-                "/api/v1/status/",
-                "/api/v1/unauthorized/",
-                "/api/v1/forbidden/",
-                "/api/v1/auth_session/login/",
-            ],
-        ):
+        if auth.require_auth(request.path, EXCLUDED_PATHS):
             if (
                 not auth.authorization_header(request) and
                 not auth.session_cookie(request)
             ):
                 return abort(401)
-            if not auth.current_user(request):
+            if not request.current_user:
                 return abort(403)
     return
 
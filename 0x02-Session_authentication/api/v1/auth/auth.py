@@ -2,16 +2,61 @@
 """Auth module for handling authentication and authorization."""
 
 from flask import request
-from typing import List, TypeVar
-from fnmatch import fnmatch
+from api.v1.auth.path_matcher import path_matcher
+from typing import Callable, List, TypeVar
+from functools import wraps
 from os import getenv
 
 
+def memoize_current_user(current_user: Callable) -> Callable:
+    """
+    Decorates a current_user method so that it resolves the user once
+    per request: the result is kept on the request object, by auth
+    instance, and returned by the next calls with the same request.
+
+    Args:
+        current_user (Callable): The current_user method.
+
+    Returns:
+        Callable: The memoized method.
+    """
+    @wraps(current_user)
+    def memoized(self, request=None):
+        if request is None:
+            return current_user(self, request)
+        try:
+            users = request._current_users
+        except AttributeError:
+            users = {}
+            try:
+                request._current_users = users
+            except AttributeError:
+                return current_user(self, request)
+        key = (self, current_user)
+        if key not in users:
+            users[key] = current_user(self, request)
+        return users[key]
+
+    memoized.memoized = True
+    return memoized
+
+
 class Auth:
     """
     Auth class for handling authentication and authorization.
+
+    The current_user method of every subclass is memoized per request
+    by memoize_current_user.
     """
 
+    def __init_subclass__(cls, **kwargs):
+        """Memoizes the current_user method defined by a subclass."""
+        super().__init_subclass__(**kwargs)
+        current_user = cls.__dict__.get("current_user")
+        if current_user is not None and \
+                not getattr(current_user, "memoized", False):
+            cls.current_user = memoize_current_user(current_user)
+
     def require_auth(self, path: str, excluded_paths: List[str]) -> bool:
         """
         Checks if authentication is required for a given path.
@@ -19,7 +64,9 @@ class Auth:
         Args:
             path (str): The path to check.
             excluded_paths (List[str]): List of paths that are
-            excluded from authentication.
+            excluded from authentication, fnmatch patterns. Their
+            matcher is compiled once, pass a tuple constant to reuse it
+            without rebuilding the key.
 
         Returns:
             bool: True if authentication is required, False otherwise.
@@ -28,7 +75,7 @@ class Auth:
             return True
         if path[-1] != "/":
             path += "/"
-        return not [n for n in excluded_paths if fnmatch(path, n)]
+        return not path_matcher(excluded_paths).match(path)
 
     def authorization_header(self, request=None) -> str:
         """
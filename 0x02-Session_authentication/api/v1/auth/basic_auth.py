@@ -2,13 +2,45 @@
 """BasicAuth module for handling basic authentication."""
 
 from api.v1.auth.auth import Auth
+from api.v1.auth.session_cache import SessionCache
 from typing import TypeVar
 from models.user import User
+from os import getenv
 import base64
+import hashlib
+import hmac
+import os
+
+
+# Maximum number of verified Authorization headers kept
+try:
+    CREDENTIALS_CACHE_SIZE = int(getenv("CREDENTIALS_CACHE_SIZE", 10000))
+except ValueError:
+    CREDENTIALS_CACHE_SIZE = 10000
+# Seconds a verified Authorization header is trusted without checking;
+# 0 or less, like a size of 0 or less, disables the cache
+try:
+    CREDENTIALS_CACHE_TTL = int(getenv("CREDENTIALS_CACHE_TTL", 60))
+except ValueError:
+    CREDENTIALS_CACHE_TTL = 0
 
 
 class BasicAuth(Auth):
-    """Class representing basic authentication."""
+    """Class representing basic authentication.
+
+    Verified Authorization headers are cached by their HMAC, with a key
+    drawn at startup, so the cache never holds credentials. An entry
+    keeps the user ID and the password hash it was verified against:
+    it stops matching once the password changes or the user is removed.
+    credentials_cache is None when the cache is disabled.
+    """
+
+    credentials_cache = None
+    if CREDENTIALS_CACHE_SIZE > 0 and CREDENTIALS_CACHE_TTL > 0:
+        credentials_cache = SessionCache(
+            CREDENTIALS_CACHE_SIZE, CREDENTIALS_CACHE_TTL
+        )
+    _credentials_key = os.urandom(32)
 
     def extract_base64_authorization_header(
             self, authorization_header: str
@@ -113,7 +145,28 @@ class BasicAuth(Auth):
             TypeVar('User'): The current user object.
         """
         auth = self.authorization_header(request)
+        if not auth or type(auth) != str:  # noqa
+            return None
+        cache = self.credentials_cache
+        if cache is not None:
+            digest = hmac.new(
+                self._credentials_key, auth.encode(), hashlib.sha256
+            ).digest()
+            verified = cache.get(digest)
+            if verified is not None:
+                user_id, password_hash = verified
+                try:
+                    user = User.get(user_id)
+                except KeyError:
+                    user = None
+                if user is not None and user.password == password_hash:
+                    return user
+                cache.pop(digest)
+
         extracted = self.extract_base64_authorization_header(auth)
         decoded = self.decode_base64_authorization_header(extracted)
         email, password = self.extract_user_credentials(decoded)
-        return self.user_object_from_credentials(email, password)
+        user = self.user_object_from_credentials(email, password)
+        if user is not None and cache is not None:
+            cache.set(digest, (user.id, user.password))
+        return user
@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""ChainAuth module for trying several authentication strategies."""
+from api.v1.auth.auth import Auth
+from typing import List, TypeVar
+
+
+class ChainAuth(Auth):
+    """
+    Tries several authentication strategies in order, e.g. a session
+    cookie then Basic credentials, the first one resolving a user wins.
+
+    Attributes:
+        auths (list): The strategies, in the order they are tried.
+    """
+
+    def __init__(self, auths: List[Auth]):
+        """
+        Initialize a ChainAuth.
+
+        Args:
+            auths (list): The strategies, in the order they are tried.
+        """
+        self.auths = list(auths)
+
+    def __getattr__(self, name: str):
+        """
+        Delegates the attributes the chain lacks, such as
+        create_session() or session_store, to the first strategy
+        having them.
+        """
+        if name.startswith("_") or name == "auths":
+            raise AttributeError(name)
+        for auth in self.auths:
+            try:
+                return getattr(auth, name)
+            except AttributeError:
+                continue
+        raise AttributeError(
+            "{!r} object has no attribute {!r}".format(
+                type(self).__name__, name)
+        )
+
+    def current_user(self, request=None) -> TypeVar("User"):
+        """
+        Retrieves the current user from the request, with the first
+        strategy that resolves one.
+
+        Args:
+            request: The request object.
+
+        Returns:
+            User: The current user, None if no strategy resolves one.
+        """
+        for auth in self.auths:
+            user = auth.current_user(request)
+            if user is not None:
+                return user
+        return None
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""PathMatcher module for matching paths against glob patterns."""
+from fnmatch import translate
+from functools import lru_cache
+from typing import Sequence, Tuple
+import re
+
+
+# Key of the trie nodes ending a prefix
+_END = None
+
+
+class PathMatcher:
+    """
+    Matches paths against fnmatch patterns, compiled once:
+    patterns without wildcards go to a set, patterns whose only
+    wildcard is a trailing "*" go to a prefix trie, and the others are
+    combined into a single regular expression.
+
+    Attributes:
+        patterns (tuple): The patterns.
+    """
+
+    def __init__(self, patterns: Tuple[str, ...]):
+        """
+        Initialize a PathMatcher.
+
+        Args:
+            patterns (tuple): The fnmatch patterns.
+        """
+        self.patterns = patterns
+        self._exact = set()
+        self._prefixes = {}
+        globs = []
+        for pattern in patterns:
+            wildcards = sum(pattern.count(c) for c in "*?[")
+            if not wildcards:
+                self._exact.add(pattern)
+            elif wildcards == 1 and pattern.endswith("*"):
+                node = self._prefixes
+                for char in pattern[:-1]:
+                    node = node.setdefault(char, {})
+                node[_END] = True
+            else:
+                globs.append(translate(pattern))
+        self._glob = re.compile("|".join(globs)).match if globs else None
+
+    def match(self, path: str) -> bool:
+        """
+        Checks if a path matches one of the patterns.
+
+        Args:
+            path (str): The path.
+
+        Returns:
+            bool: True if a pattern matches the path.
+        """
+        if path in self._exact:
+            return True
+        node = self._prefixes
+        if node:
+            for char in path:
+                if _END in node:
+                    return True
+                node = node.get(char)
+                if node is None:
+                    break
+            else:
+                if _END in node:
+                    return True
+        return self._glob is not None and self._glob(path) is not None
+
+
+@lru_cache(maxsize=128)
+def _compile(patterns: Tuple[str, ...]) -> PathMatcher:
+    """Builds the matcher of a tuple of patterns."""
+    return PathMatcher(patterns)
+
+
+# Last patterns matched and their matcher, looked up by identity
+_last = (None, None)
+
+
+def path_matcher(patterns: Sequence[str]) -> PathMatcher:
+    """
+    Returns the matcher of patterns, built once per distinct patterns.
+
+    Passing the same tuple on every call, such as a module constant,
+    finds its matcher in constant time whatever the number of patterns.
+
+    Args:
+        patterns (Sequence[str]): The fnmatch patterns.
+
+    Returns:
+        PathMatcher: The matcher.
+    """
+    global _last
+    last_patterns, matcher = _last
+    if patterns is last_patterns:
+        return matcher
+    matcher = _compile(tuple(patterns))
+    if type(patterns) is tuple:
+        _last = (patterns, matcher)
+    return matcher
@@ -0,0 +1,266 @@
+#!/usr/bin/env python3
+"""RedisSessionStore module keeping sessions in a Redis server."""
+from api.v1.auth.session_store import SessionStore
+from typing import Dict, List
+from urllib.parse import urlparse
+import socket
+import threading
+
+
+class RESPError(Exception):
+    """Error reply of the server."""
+
+
+class RESPClient:
+    """
+    Minimal client of the Redis protocol (RESP) over one connection,
+    opened on first use and reopened after a network error.
+
+    Attributes:
+        round_trips (int): Requests sent to the server.
+        commands (int): Commands sent to the server.
+    """
+
+    def __init__(
+        self, host: str = "localhost", port: int = 6379, db: int = 0,
+        timeout: float = 5.0
+    ):
+        """
+        Initialize a RESPClient.
+
+        Args:
+            host (str): The host of the server.
+            port (int): The port of the server.
+            db (int): The database selected.
+            timeout (float): Socket timeout in seconds.
+        """
+        self.host = host
+        self.port = port
+        self.db = db
+        self.timeout = timeout
+        self.round_trips = 0
+        self.commands = 0
+        self._sock = None
+        self._file = None
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _encode(args: tuple) -> bytes:
+        """Encode a command as a RESP array of bulk strings."""
+        parts = [b"*%d\r\n" % len(args)]
+        for arg in args:
+            if not isinstance(arg, bytes):
+                arg = str(arg).encode()
+            parts.append(b"$%d\r\n%s\r\n" % (len(arg), arg))
+        return b"".join(parts)
+
+    def _read(self):
+        """Read one reply."""
+        line = self._file.readline()
+        if not line.endswith(b"\r\n"):
+            raise ConnectionError("connection closed by the server")
+        prefix, payload = line[:1], line[1:-2]
+        if prefix == b"+":
+            return payload.decode()
+        if prefix == b"-":
+            return RESPError(payload.decode())
+        if prefix == b":":
+            return int(payload)
+        if prefix == b"$":
+            size = int(payload)
+            if size < 0:
+                return None
+            return self._file.read(size + 2)[:-2].decode()
+        if prefix == b"*":
+            size = int(payload)
+            if size < 0:
+                return None
+            return [self._read() for _ in range(size)]
+        raise ConnectionError("invalid reply: {!r}".format(line))
+
+    def _connect(self):
+        """Open the connection, lock held."""
+        self._sock = socket.create_connection(
+            (self.host, self.port), self.timeout
+        )
+        self._sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self._file = self._sock.makefile("rb")
+        if self.db:
+            self._sock.sendall(self._encode(("SELECT", self.db)))
+            reply = self._read()
+            if isinstance(reply, RESPError):
+                raise reply
+
+    def close(self):
+        """Close the connection."""
+        with self._lock:
+            if self._sock is not None:
+                self._file.close()
+                self._sock.close()
+                self._sock = self._file = None
+
+    def execute_many(self, commands: List[tuple]) -> list:
+        """
+        Send commands in a single write and read all their replies, so
+        they cost one round trip.
+
+        Args:
+            commands (list): The commands, each a tuple of arguments.
+
+        Returns:
+            list: The replies, error replies as RESPError instances.
+        """
+        request = b"".join(self._encode(args) for args in commands)
+        with self._lock:
+            for attempt in (1, 2):
+                try:
+                    if self._sock is None:
+                        self._connect()
+                    self._sock.sendall(request)
+                    replies = [self._read() for _ in commands]
+                    break
+                except (ConnectionError, socket.timeout):
+                    if self._sock is not None:
+                        self._file.close()
+                        self._sock.close()
+                        self._sock = self._file = None
+                    if attempt == 2:
+                        raise
+            self.round_trips += 1
+            self.commands += len(commands)
+        return replies
+
+    def execute(self, *args):
+        """
+        Run one command.
+
+        Returns:
+            The reply of the server.
+
+        Raises:
+            RESPError: The server replied with an error.
+        """
+        reply = self.execute_many([args])[0]
+        if isinstance(reply, RESPError):
+            raise reply
+        return reply
+
+    def pipeline(self) -> "Pipeline":
+        """Create a pipeline of commands sent together."""
+        return Pipeline(self)
+
+
+class Pipeline:
+    """
+    Commands queued to be sent in one round trip by execute().
+    """
+
+    def __init__(self, client: RESPClient):
+        """Initialize an empty Pipeline."""
+        self.client = client
+        self.commands = []
+
+    def __getattr__(self, name: str):
+        """Queue a command named after the attribute, e.g. p.get(key)."""
+        if name.startswith("_"):
+            raise AttributeError(name)
+
+        def queue(*args) -> "Pipeline":
+            self.commands.append((name.upper(),) + args)
+            return self
+        return queue
+
+    def __enter__(self) -> "Pipeline":
+        """Use the pipeline in a with block."""
+        return self
+
+    def __exit__(self, *exc_info):
+        """Drop the commands not executed."""
+        self.commands = []
+
+    def execute(self) -> list:
+        """Send the queued commands and return their replies."""
+        commands, self.commands = self.commands, []
+        if not commands:
+            return []
+        return self.client.execute_many(commands)
+
+
+class RedisSessionStore(SessionStore):
+    """
+    Keeps the sessions in a Redis server, shared by all the processes
+    and hosts using it; sessions expire with native key TTLs.
+
+    Attributes:
+        client (RESPClient): The connection to the server.
+        prefix (str): Prefix of the session keys.
+    """
+
+    def __init__(self, client: RESPClient, prefix: str = "session:"):
+        """
+        Initialize a RedisSessionStore.
+
+        Args:
+            client (RESPClient): The connection to the server.
+            prefix (str): Prefix of the session keys.
+        """
+        self.client = client
+        self.prefix = prefix
+
+    @classmethod
+    def from_url(cls, url: str) -> "RedisSessionStore":
+        """
+        Creates a store from a redis://host:port/db URL.
+
+        Args:
+            url (str): The URL of the server.
+
+        Returns:
+            RedisSessionStore: The store.
+        """
+        parsed = urlparse(url)
+        db = parsed.path.strip("/")
+        return cls(RESPClient(
+            parsed.hostname or "localhost", parsed.port or 6379,
+            int(db) if db else 0
+        ))
+
+    def get(self, session_id: str) -> str:
+        """Retrieves the user ID of a live session, in one round trip."""
+        return self.client.execute("GET", self.prefix + session_id)
+
+    def get_many(self, session_ids: List[str]) -> Dict[str, str]:
+        """Retrieves the user IDs of several sessions, in one round trip."""
+        with self.client.pipeline() as pipe:
+            for session_id in session_ids:
+                pipe.get(self.prefix + session_id)
+            replies = pipe.execute()
+        return {
+            session_id: user_id
+            for session_id, user_id in zip(session_ids, replies)
+            if isinstance(user_id, str)
+        }
+
+    def set(self, session_id: str, user_id: str, ttl: int = None):
+        """Stores a session, expiring after ttl seconds if given."""
+        args = ["SET", self.prefix + session_id, user_id]
+        if ttl:
+            args += ["EX", ttl]
+        self.client.execute(*args)
+
+    def delete(self, session_id: str) -> bool:
+        """Deletes a session."""
+        return self.client.execute("DEL", self.prefix + session_id) > 0
+
+    def sessions(self) -> Dict[str, str]:
+        """Lists the live sessions, in two round trips."""
+        keys = self.client.execute("KEYS", self.prefix + "*")
+        prefix = len(self.prefix)
+        return self.get_many([key[prefix:] for key in keys])
+
+    def stats(self) -> dict:
+        """Round trips and commands sent to the server."""
+        return {
+            "round_trips": self.client.round_trips,
+            "commands": self.client.commands,
+        }
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""Registry module of the authentication strategies."""
+from api.v1.auth.auth import Auth
+from importlib import import_module
+
+
+# Module and class of each strategy, imported when first selected
+AUTH_TYPES = {
+    "auth": ("api.v1.auth.auth", "Auth"),
+    "basic_auth": ("api.v1.auth.basic_auth", "BasicAuth"),
+    "session_auth": ("api.v1.auth.session_auth", "SessionAuth"),
+    "session_exp_auth": ("api.v1.auth.session_exp_auth", "SessionExpAuth"),
+    "session_db_auth": ("api.v1.auth.session_db_auth", "SessionDBAuth"),
+}
+
+
+def register_auth(name: str, module: str, class_name: str):
+    """
+    Registers a strategy under a name usable in AUTH_TYPE.
+
+    Args:
+        name (str): The name of the strategy.
+        module (str): The module defining the strategy.
+        class_name (str): The Auth subclass in the module.
+    """
+    AUTH_TYPES[name] = (module, class_name)
+
+
+def auth_class(name: str) -> type:
+    """
+    Imports the class of a strategy.
+
+    Args:
+        name (str): The name of the strategy.
+
+    Returns:
+        type: The Auth subclass.
+
+    Raises:
+        ValueError: No strategy is registered under this name.
+    """
+    try:
+        module, class_name = AUTH_TYPES[name]
+    except KeyError:
+        raise ValueError("Unknown auth type: {}".format(name)) from None
+    return getattr(import_module(module), class_name)
+
+
+def load_auth(auth_type: str) -> Auth:
+    """
+    Creates the strategy selected by an AUTH_TYPE value, only
+    importing its module. Several comma separated names, e.g.
+    "session_auth,basic_auth", are tried in this order by a ChainAuth.
+
+    Args:
+        auth_type (str): The AUTH_TYPE value.
+
+    Returns:
+        Auth: The strategy, None if auth_type is empty.
+
+    Raises:
+        ValueError: A name is not registered.
+    """
+    names = [name.strip() for name in (auth_type or "").split(",")]
+    auths = [auth_class(name)() for name in names if name]
+    if not auths:
+        return None
+    if len(auths) == 1:
+        return auths[0]
+    from api.v1.auth.chain_auth import ChainAuth
+
+    return ChainAuth(auths)
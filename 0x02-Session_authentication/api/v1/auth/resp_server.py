@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+"""RESPServer module, a small local stand-in for a Redis server."""
+from fnmatch import fnmatchcase
+from socketserver import StreamRequestHandler, ThreadingTCPServer
+from typing import Tuple
+import threading
+import time
+
+
+class _Handler(StreamRequestHandler):
+    """Serves the commands of one client connection."""
+
+    def handle(self):
+        """Read commands and write their replies until disconnected."""
+        while True:
+            try:
+                args = self._read_command()
+            except (ConnectionError, ValueError):
+                return
+            if args is None:
+                return
+            self.wfile.write(self.server.run(args))
+
+    def _read_command(self) -> list:
+        """Read one command sent as a RESP array of bulk strings."""
+        line = self.rfile.readline()
+        if not line:
+            return None
+        if line[:1] != b"*":
+            raise ValueError("expected an array")
+        args = []
+        for _ in range(int(line[1:])):
+            size = int(self.rfile.readline()[1:])
+            args.append(self.rfile.read(size + 2)[:-2].decode())
+        return args
+
+
+class RESPServer(ThreadingTCPServer):
+    """
+    In-process server speaking enough of the Redis protocol for the
+    session stores: PING, GET, SET (with EX/PX), DEL, EXISTS, EXPIRE,
+    TTL, KEYS, SELECT, DBSIZE and FLUSHDB. Keys expire lazily when read.
+
+    Attributes:
+        data (dict): Value and monotonic expiry time of each key.
+    """
+
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0):
+        """
+        Initialize a RESPServer, listening on an ephemeral port by
+        default.
+
+        Args:
+            host (str): The host to listen on.
+            port (int): The port to listen on.
+        """
+        super().__init__((host, port), _Handler)
+        self.data = {}
+        self._lock = threading.Lock()
+        self._thread = None
+
+    @property
+    def address(self) -> Tuple[str, int]:
+        """Host and port the server listens on."""
+        return self.server_address[:2]
+
+    @property
+    def url(self) -> str:
+        """redis:// URL of the server."""
+        return "redis://{}:{}/0".format(*self.address)
+
+    def start(self) -> "RESPServer":
+        """Serve from a background thread."""
+        self._thread = threading.Thread(
+            target=self.serve_forever, daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """Stop serving and close the socket."""
+        self.shutdown()
+        self.server_close()
+
+    def _live(self, key: str) -> tuple:
+        """Entry of a key, dropping it if it expired, lock held."""
+        entry = self.data.get(key)
+        if entry is not None and entry[1] is not None and \
+                entry[1] <= time.monotonic():
+            del self.data[key]
+            entry = None
+        return entry
+
+    def run(self, args: list) -> bytes:
+        """Run a command and return its encoded reply."""
+        if not args:
+            return b"-ERR empty command\r\n"
+        command = args[0].upper()
+        method = getattr(self, "_cmd_" + command.lower(), None)
+        if method is None:
+            return "-ERR unknown command '{}'\r\n".format(command).encode()
+        try:
+            with self._lock:
+                return method(*args[1:])
+        except (TypeError, ValueError):
+            return "-ERR wrong arguments for '{}' command\r\n".format(
+                command).encode()
+
+    @staticmethod
+    def _bulk(value: str) -> bytes:
+        """Encode a bulk string reply."""
+        if value is None:
+            return b"$-1\r\n"
+        value = value.encode()
+        return b"$%d\r\n%s\r\n" % (len(value), value)
+
+    def _cmd_ping(self) -> bytes:
+        """PING command."""
+        return b"+PONG\r\n"
+
+    def _cmd_select(self, db: str) -> bytes:
+        """SELECT command."""
+        return b"+OK\r\n"
+
+    def _cmd_get(self, key: str) -> bytes:
+        """GET command."""
+        entry = self._live(key)
+        return self._bulk(entry and entry[0])
+
+    def _cmd_set(self, key: str, value: str, *options: str) -> bytes:
+        """SET command."""
+        expiry = None
+        options = list(options)
+        while options:
+            option = options.pop(0).upper()
+            if option == "EX":
+                expiry = time.monotonic() + int(options.pop(0))
+            elif option == "PX":
+                expiry = time.monotonic() + int(options.pop(0)) / 1000
+            else:
+                raise ValueError(option)
+        self.data[key] = (value, expiry)
+        return b"+OK\r\n"
+
+    def _cmd_del(self, *keys: str) -> bytes:
+        """DEL command."""
+        deleted = 0
+        for key in keys:
+            if self._live(key) is not None:
+                del self.data[key]
+                deleted += 1
+        return b":%d\r\n" % deleted
+
+    def _cmd_exists(self, *keys: str) -> bytes:
+        """EXISTS command."""
+        return b":%d\r\n" % sum(self._live(k) is not None for k in keys)
+
+    def _cmd_expire(self, key: str, seconds: str) -> bytes:
+        """EXPIRE command."""
+        entry = self._live(key)
+        if entry is None:
+            return b":0\r\n"
+        self.data[key] = (entry[0], time.monotonic() + int(seconds))
+        return b":1\r\n"
+
+    def _cmd_ttl(self, key: str) -> bytes:
+        """TTL command."""
+        entry = self._live(key)
+        if entry is None:
+            return b":-2\r\n"
+        if entry[1] is None:
+            return b":-1\r\n"
+        return b":%d\r\n" % round(entry[1] - time.monotonic())
+
+    def _cmd_keys(self, pattern: str) -> bytes:
+        """KEYS command."""
+        keys = [k for k in list(self.data) if fnmatchcase(k, pattern) and
+                self._live(k) is not None]
+        return b"*%d\r\n" % len(keys) + b"".join(map(self._bulk, keys))
+
+    def _cmd_dbsize(self) -> bytes:
+        """DBSIZE command."""
+        return b":%d\r\n" % len(self.data)
+
+    def _cmd_flushdb(self) -> bytes:
+        """FLUSHDB command."""
+        self.data.clear()
+        return b"+OK\r\n"
@@ -1,6 +1,7 @@
 #!/usr/bin/env python3
 """SessionAuth module for handling session-based authentication."""
 from api.v1.auth.auth import Auth
+from api.v1.auth.session_store import load_session_store
 import uuid
 
 
@@ -9,11 +10,21 @@ class SessionAuth(Auth):
     SessionAuth class provides methods for session-based authentication.
 
     Attributes:
-        user_id_by_session_id (dict): A dictionary that
-        maps session IDs to user IDs.
+        session_store (SessionStore): The store that maps session IDs
+        to user IDs, selected by SESSION_STORE.
     """
 
-    user_id_by_session_id = {}
+    session_store = load_session_store()
+
+    @property
+    def user_id_by_session_id(self) -> dict:
+        """
+        The live sessions of the store.
+
+        Returns:
+            dict: The user ID of each session ID.
+        """
+        return self.session_store.sessions()
 
     def create_session(self, user_id: str = None) -> str:
         """
@@ -29,9 +40,18 @@ class SessionAuth(Auth):
         if not user_id or type(user_id) != str:  # noqa
             return None
         session_id = str(uuid.uuid4())
-        self.user_id_by_session_id[session_id] = user_id
+        self.session_store.set(session_id, user_id, self.session_ttl())
         return session_id
 
+    def session_ttl(self) -> int:
+        """
+        Lifetime of the new sessions.
+
+        Returns:
+            int: The lifetime in seconds, None if sessions do not expire.
+        """
+        return None
+
     def user_id_for_session_id(self, session_id: str = None) -> str:
         """
         Retrieve the user ID associated with the given session ID.
@@ -45,7 +65,7 @@ class SessionAuth(Auth):
         """
         if not session_id or type(session_id) != str:  # noqa
             return None
-        return self.user_id_by_session_id.get(session_id, None)
+        return self.session_store.get(session_id)
 
     def current_user(self, request=None):
         """
@@ -81,5 +101,5 @@ class SessionAuth(Auth):
         session_id = self.session_cookie(request)
         if not session_id or not self.user_id_for_session_id(session_id):
             return False
-        del self.user_id_by_session_id[session_id]
+        self.session_store.delete(session_id)
         return True
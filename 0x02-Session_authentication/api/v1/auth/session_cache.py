@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+"""SessionCache module for bounded, expiring session storage."""
+from collections import OrderedDict
+from typing import Any, Hashable
+import threading
+import time
+
+
+class SessionCache:
+    """
+    Dictionary bounded to maxsize entries, evicting the least recently
+    used one when full, whose entries can expire.
+
+    Each entry is a (value, expiry) tuple, expiry being a
+    time.monotonic() deadline or None for entries that do not expire.
+    Expired entries are dropped when they are looked up, or all at once
+    by expire().
+
+    Attributes:
+        maxsize (int): The maximum number of entries.
+        ttl (float): Lifetime in seconds of the entries, None if they
+        do not expire unless set with their own ttl.
+        hits (int): Lookups that found a live entry.
+        misses (int): Lookups that found no entry, or an expired one.
+        evictions (int): Entries evicted to make room.
+        expirations (int): Expired entries dropped.
+    """
+
+    def __init__(self, maxsize: int, ttl: float = None):
+        """
+        Initialize an empty SessionCache.
+
+        Args:
+            maxsize (int): The maximum number of entries.
+            ttl (float): Default lifetime in seconds of the entries.
+        """
+        if maxsize <= 0:
+            raise ValueError("maxsize must be positive")
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        """Number of entries, expired ones included until dropped."""
+        return len(self._entries)
+
+    def __contains__(self, key: Hashable) -> bool:
+        """Check if a key has a live entry, without counting a lookup."""
+        with self._lock:
+            entry = self._entries.get(key)
+            return entry is not None and not self._expired(key, entry)
+
+    def __getitem__(self, key: Hashable) -> Any:
+        """Value of a key, raising KeyError if it has no live entry."""
+        value = self.get(key, self)
+        if value is self:
+            raise KeyError(key)
+        return value
+
+    def __setitem__(self, key: Hashable, value: Any):
+        """Set the value of a key, with the default ttl."""
+        self.set(key, value)
+
+    def __delitem__(self, key: Hashable):
+        """Remove the entry of a key, raising KeyError if there is none."""
+        with self._lock:
+            del self._entries[key]
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """
+        Retrieve the value of a key and mark it as recently used.
+
+        Args:
+            key (Hashable): The key.
+            default (Any): Returned when the key has no live entry.
+
+        Returns:
+            Any: The value of the key, or default.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or self._expired(key, entry):
+                self.misses += 1
+                return default
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def set(self, key: Hashable, value: Any, ttl: float = None):
+        """
+        Set the value of a key, evicting the least recently used entry
+        if the cache is full.
+
+        Args:
+            key (Hashable): The key.
+            value (Any): The value.
+            ttl (float): Lifetime in seconds of the entry, the default
+            ttl of the cache if None.
+        """
+        ttl = self.ttl if ttl is None else ttl
+        expiry = time.monotonic() + ttl if ttl else None
+        with self._lock:
+            entries = self._entries
+            if key in entries:
+                entries.move_to_end(key)
+            entries[key] = (value, expiry)
+            while len(entries) > self.maxsize:
+                entries.popitem(last=False)
+                self.evictions += 1
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        """
+        Remove the entry of a key.
+
+        Args:
+            key (Hashable): The key.
+            default (Any): Returned when the key has no entry.
+
+        Returns:
+            Any: The value of the key, or default.
+        """
+        with self._lock:
+            entry = self._entries.pop(key, None)
+        return default if entry is None else entry[0]
+
+    def items(self) -> list:
+        """
+        Snapshot of the live entries, least recently used first,
+        without counting lookups.
+
+        Returns:
+            list: The (key, value) pairs.
+        """
+        now = time.monotonic()
+        with self._lock:
+            return [
+                (key, value) for key, (value, expiry) in self._entries.items()
+                if expiry is None or expiry > now
+            ]
+
+    def expire(self) -> int:
+        """
+        Drop all expired entries.
+
+        Returns:
+            int: The number of entries dropped.
+        """
+        now = time.monotonic()
+        with self._lock:
+            expired = [
+                key for key, (_, expiry) in self._entries.items()
+                if expiry is not None and expiry <= now
+            ]
+            for key in expired:
+                del self._entries[key]
+            self.expirations += len(expired)
+        return len(expired)
+
+    def clear(self):
+        """Remove all entries."""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        """
+        Counters of the cache.
+
+        Returns:
+            dict: The size and the hit, miss, eviction and expiration
+            counters of the cache, with its hit ratio.
+        """
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+        }
+
+    def _expired(self, key: Hashable, entry: tuple) -> bool:
+        """Drop an entry if it expired, lock held."""
+        expiry = entry[1]
+        if expiry is None or expiry > time.monotonic():
+            return False
+        del self._entries[key]
+        self.expirations += 1
+        return True
@@ -4,53 +4,136 @@ SessionDBAuth module for handling
 session-based authentication using a database.
 """
 from api.v1.auth.session_exp_auth import SessionExpAuth
+from api.v1.auth.session_store import SessionStore, SWEEP_BATCH
+from api.v1.auth.ttl_index import TTLIndex
+from models.base import batch_writes
 from models.user_session import UserSession
 from datetime import datetime, timedelta
+from typing import Dict
 
 
-class SessionDBAuth(SessionExpAuth):
+class DBSessionStore(SessionStore):
     """
-    Represents a session-based authentication mechanism using a database.
+    Keeps the sessions as UserSession objects.
 
-    Inherits from the SessionExpAuth class.
+    Sessions expire session_duration seconds after they are created;
+    expired sessions are found with a TTL index and deleted by
+    expire(). The sessions stored before the store was created are
+    added to the index by the first expire(), not at startup.
+
+    Attributes:
+        session_duration (int): The duration of a session in seconds,
+        0 if sessions do not expire.
+        expiry_index (TTLIndex): Expiry time of the sessions.
     """
 
-    def create_session(self, user_id=None):
-        session_id = super().create_session(user_id)
-        if not session_id:
-            return None
-        args = {"user_id": user_id, "session_id": session_id}
-        user_session = UserSession(**args)
-        user_session.save()
-        user_session.save_to_file()
-        return session_id
+    def __init__(self, session_duration: int = 0):
+        """
+        Initialize a DBSessionStore, loading the stored sessions as raw
+        records, built into objects when first used.
+        """
+        self.session_duration = session_duration
+        self.expiry_index = TTLIndex()
+        self._seeded = session_duration <= 0
+        UserSession.refresh()
 
-    def user_id_for_session_id(self, session_id=None):
-        if not session_id:
-            return None
+    def _seed(self):
+        """Adds the sessions not tracked yet to the expiry index."""
+        self._seeded = True
+        UserSession.refresh()
+        for user_session in UserSession.all():
+            if user_session.session_id not in self.expiry_index:
+                self._track(user_session)
+
+    def _track(self, user_session):
+        """Adds a session to the expiry index, if sessions expire."""
+        if self.session_duration > 0:
+            ex = user_session.created_at + \
+                timedelta(seconds=self.session_duration)
+            self.expiry_index.add(user_session.session_id, ex)
 
-        UserSession.load_from_file()
+    def get(self, session_id):
+        """Retrieves the user ID of a live session."""
+        UserSession.refresh()
         user_session = UserSession.search({"session_id": session_id})
         if not user_session:
             return None
 
         user_session = user_session[0]
 
-        ex = user_session.created_at + timedelta(seconds=self.session_duration)
-        if ex < datetime.utcnow():
-            return None
+        if self.session_duration > 0:
+            ex = user_session.created_at + \
+                timedelta(seconds=self.session_duration)
+            if ex < datetime.utcnow():
+                self._track(user_session)
+                return None
 
         return user_session.user_id
 
-    def destroy_session(self, request=None):
-        if not request:
-            return False
-        session_id = self.session_cookie(request)
-        if not session_id or not self.user_id_for_session_id(session_id):
-            return False
+    def set(self, session_id, user_id, ttl=None):
+        """Stores a session, expiring after session_duration."""
+        args = {"user_id": user_id, "session_id": session_id}
+        user_session = UserSession(**args)
+        user_session.save()
+        self._track(user_session)
+
+    def delete(self, session_id):
+        """Deletes a session, and stops tracking its expiry."""
+        self.expiry_index.discard(session_id)
+        UserSession.refresh()
         user_session = UserSession.search({"session_id": session_id})
-        if not user_session:
-            return False
-        user_session[0].remove()
-        UserSession.save_to_file()
-        return True
+        for obj in user_session:
+            obj.remove()
+        return bool(user_session)
+
+    def sessions(self) -> Dict[str, str]:
+        """Lists the live sessions."""
+        UserSession.refresh()
+        return {
+            user_session.session_id: user_session.user_id
+            for user_session in UserSession.all()
+        }
+
+    def expire(self, batch_size=SWEEP_BATCH):
+        """
+        Deletes the expired sessions, popped from the expiry index
+        batch_size at a time and persisted once for the whole run.
+        """
+        if not self._seeded:
+            self._seed()
+        now = datetime.utcnow()
+        swept = 0
+        UserSession.refresh()
+        with batch_writes():
+            while True:
+                expired = self.expiry_index.pop_expired(now, batch_size)
+                if not expired:
+                    break
+                for session_id in expired:
+                    for user_session in UserSession.search(
+                        {"session_id": session_id}
+                    ):
+                        user_session.remove()
+                        swept += 1
+        return swept
+
+    def stats(self):
+        """Number of sessions in the expiry index."""
+        return {"tracked": len(self.expiry_index)}
+
+
+class SessionDBAuth(SessionExpAuth):
+    """
+    Represents a session-based authentication mechanism using a database.
+
+    Inherits from the SessionExpAuth class.
+    """
+
+    def new_session_store(self) -> DBSessionStore:
+        """
+        Session store of the instance.
+
+        Returns:
+            DBSessionStore: The store of the UserSession objects.
+        """
+        return DBSessionStore(self.session_duration)
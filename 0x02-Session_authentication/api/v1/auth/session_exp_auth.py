@@ -4,8 +4,14 @@ SessionExpAuth module for handling session-based
 authentication with session expiration.
 """
 from api.v1.auth.session_auth import SessionAuth
+from api.v1.auth.session_store import SessionStore, SWEEP_BATCH
 from os import getenv
-from datetime import datetime, timedelta
+import logging
+import threading
+import time
+
+
+logger = logging.getLogger(__name__)
 
 
 class SessionExpAuth(SessionAuth):
@@ -18,12 +24,15 @@ class SessionExpAuth(SessionAuth):
     Attributes:
         session_duration (int): The duration of a
         session in seconds.
+        sweep_stats (dict): Runs of sweep(), sessions swept and
+        time spent sweeping.
 
     Methods:
-        create_session(user_id=None): Creates a new
-        session for the given user ID.
+        new_session_store(): Returns the session store of the instance.
+        session_ttl(): Returns the lifetime of the new sessions.
         user_id_for_session_id(session_id=None): Retrieves the user
         ID associated with the given session ID.
+        sweep(): Deletes the expired sessions.
     """
 
     def __init__(self):
@@ -31,26 +40,46 @@ class SessionExpAuth(SessionAuth):
             self.session_duration = int(getenv("SESSION_DURATION", 0))
         except ValueError:
             self.session_duration = 0
+        try:
+            self.sweep_interval = float(getenv("SESSION_SWEEP_INTERVAL", 60))
+        except ValueError:
+            self.sweep_interval = 0
+        self.sweep_stats = {
+            "runs": 0,
+            "swept": 0,
+            "last_swept": 0,
+            "last_duration": 0.0,
+            "total_duration": 0.0,
+        }
+        self.session_store = self.new_session_store()
+        self._sweeper = None
+        if self.session_duration > 0 and self.sweep_interval > 0:
+            self._sweeper = threading.Thread(
+                target=self._sweep_forever, daemon=True
+            )
+            self._sweeper.start()
 
-    def create_session(self, user_id=None):
+    def new_session_store(self) -> SessionStore:
         """
-        Creates a new session for the given user ID.
+        Session store of the instance, created once the settings are
+        read and before the sweeper starts.
 
-        Args:
-            user_id (str): The ID of the user.
+        Returns:
+            SessionStore: The store shared by the session classes.
+        """
+        return type(self).session_store
+
+    def session_ttl(self):
+        """
+        Lifetime of the new sessions.
 
         Returns:
-            str: The session ID if the session was
-            created successfully, None otherwise.
+            int: The session duration in seconds, None if sessions
+            do not expire.
         """
-        session_id = super().create_session(user_id)
-        if not session_id:
-            return None
-        self.user_id_by_session_id[session_id] = {
-            "user_id": user_id,
-            "created_at": datetime.now(),
-        }
-        return session_id
+        if self.session_duration > 0:
+            return self.session_duration
+        return None
 
     def user_id_for_session_id(self, session_id=None):
         """
@@ -65,15 +94,38 @@ class SessionExpAuth(SessionAuth):
         """
         if not session_id:
             return None
-        session_dict = super().user_id_for_session_id(session_id)
-        if not session_dict:
-            return None
-        if self.session_duration <= 0:
-            return session_dict.get("user_id", None)
-        created_at = session_dict.get("created_at", None)
-        if not created_at:
-            return None
-        exp = created_at + timedelta(seconds=self.session_duration)
-        if exp < datetime.now():
-            return None
-        return session_dict.get("user_id", None)
+        return super().user_id_for_session_id(session_id)
+
+    def sweep(self, batch_size: int = SWEEP_BATCH) -> int:
+        """
+        Deletes the expired sessions from the session store,
+        batch_size at a time. Updates sweep_stats.
+
+        Args:
+            batch_size (int): The number of sessions deleted at once.
+
+        Returns:
+            int: The number of sessions deleted.
+        """
+        start = time.perf_counter()
+        swept = self.session_store.expire(batch_size)
+        duration = time.perf_counter() - start
+        stats = self.sweep_stats
+        stats["runs"] += 1
+        stats["swept"] += swept
+        stats["last_swept"] = swept
+        stats["last_duration"] = duration
+        stats["total_duration"] += duration
+        return swept
+
+    def _sweep_forever(self):
+        """
+        Calls sweep() every sweep_interval seconds, from the sweeper
+        thread. A failed sweep is logged and retried at the next one.
+        """
+        while True:
+            time.sleep(self.sweep_interval)
+            try:
+                self.sweep()
+            except Exception:
+                logger.exception("Session sweep failed")
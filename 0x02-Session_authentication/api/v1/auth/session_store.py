@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""SessionStore module defining where sessions are kept."""
+from api.v1.auth.session_cache import SessionCache
+from os import getenv
+from typing import Dict, List
+
+
+# Maximum number of sessions kept in memory
+try:
+    SESSION_CACHE_SIZE = int(getenv("SESSION_CACHE_SIZE", 100000))
+except ValueError:
+    SESSION_CACHE_SIZE = 100000
+# Sessions removed at once by expire()
+SWEEP_BATCH = 1000
+
+
+class SessionStore:
+    """
+    Interface of the session stores, mapping session IDs to user IDs.
+    """
+
+    def get(self, session_id: str) -> str:
+        """
+        Retrieves the user ID of a live session.
+
+        Args:
+            session_id (str): The ID of the session.
+
+        Returns:
+            str: The user ID, None if there is no such live session.
+        """
+        raise NotImplementedError
+
+    def get_many(self, session_ids: List[str]) -> Dict[str, str]:
+        """
+        Retrieves the user IDs of several sessions.
+
+        Args:
+            session_ids (list): The IDs of the sessions.
+
+        Returns:
+            dict: The user ID of each live session.
+        """
+        user_ids = {}
+        for session_id in session_ids:
+            user_id = self.get(session_id)
+            if user_id is not None:
+                user_ids[session_id] = user_id
+        return user_ids
+
+    def set(self, session_id: str, user_id: str, ttl: int = None):
+        """
+        Stores a session.
+
+        Args:
+            session_id (str): The ID of the session.
+            user_id (str): The ID of the user.
+            ttl (int): Lifetime of the session in seconds, None if it
+            does not expire.
+        """
+        raise NotImplementedError
+
+    def delete(self, session_id: str) -> bool:
+        """
+        Deletes a session.
+
+        Args:
+            session_id (str): The ID of the session.
+
+        Returns:
+            bool: True if the session existed.
+        """
+        raise NotImplementedError
+
+    def sessions(self) -> Dict[str, str]:
+        """
+        Lists the live sessions.
+
+        Returns:
+            dict: The user ID of each session.
+        """
+        raise NotImplementedError
+
+    def expire(self, batch_size: int = SWEEP_BATCH) -> int:
+        """
+        Deletes the expired sessions, for stores that do not do it
+        themselves.
+
+        Args:
+            batch_size (int): The number of sessions deleted at once.
+
+        Returns:
+            int: The number of sessions deleted.
+        """
+        return 0
+
+    def stats(self) -> dict:
+        """
+        Counters of the store.
+
+        Returns:
+            dict: The counters.
+        """
+        return {}
+
+
+class MemorySessionStore(SessionStore):
+    """
+    Keeps the sessions of this process in a SessionCache.
+
+    Attributes:
+        cache (SessionCache): The sessions, evicting the least recently
+        used ones beyond maxsize.
+    """
+
+    def __init__(self, maxsize: int = SESSION_CACHE_SIZE):
+        """
+        Initialize a MemorySessionStore.
+
+        Args:
+            maxsize (int): The maximum number of sessions.
+        """
+        self.cache = SessionCache(maxsize)
+
+    def get(self, session_id: str) -> str:
+        """Retrieves the user ID of a live session."""
+        return self.cache.get(session_id)
+
+    def set(self, session_id: str, user_id: str, ttl: int = None):
+        """Stores a session."""
+        self.cache.set(session_id, user_id, ttl=ttl)
+
+    def delete(self, session_id: str) -> bool:
+        """Deletes a session."""
+        return self.cache.pop(session_id) is not None
+
+    def sessions(self) -> Dict[str, str]:
+        """Lists the live sessions."""
+        return dict(self.cache.items())
+
+    def expire(self, batch_size: int = SWEEP_BATCH) -> int:
+        """Deletes the expired sessions."""
+        return self.cache.expire()
+
+    def stats(self) -> dict:
+        """Counters of the cache."""
+        return self.cache.stats()
+
+
+def load_session_store() -> SessionStore:
+    """
+    Creates the session store selected by SESSION_STORE: "memory"
+    (default) or "redis", at the SESSION_STORE_URL address.
+
+    Returns:
+        SessionStore: The session store.
+    """
+    store = getenv("SESSION_STORE", "memory")
+    if store == "memory":
+        return MemorySessionStore()
+    if store == "redis":
+        from api.v1.auth.redis_session_store import RedisSessionStore
+
+        return RedisSessionStore.from_url(
+            getenv("SESSION_STORE_URL", "redis://localhost:6379/0")
+        )
+    raise ValueError("Unknown session store: {}".format(store))
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""TTLIndex module for tracking when keys expire."""
+from datetime import datetime
+from typing import Hashable, List
+import heapq
+import threading
+
+
+class TTLIndex:
+    """
+    Min-heap of keys ordered by expiry time.
+
+    Updating or discarding a key leaves its old heap entry in place; an
+    entry is stale when it no longer matches the expiry recorded for its
+    key, and is skipped when it reaches the top of the heap.
+
+    Attributes:
+        expiries (dict): Current expiry time of each key.
+    """
+
+    def __init__(self):
+        """Initialize an empty TTLIndex."""
+        self.expiries = {}
+        self._heap = []
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        """Number of keys tracked."""
+        return len(self.expiries)
+
+    def __contains__(self, key: Hashable) -> bool:
+        """Checks if a key is tracked."""
+        return key in self.expiries
+
+    def add(self, key: Hashable, expires_at: datetime):
+        """
+        Track a key, or move it to a new expiry time.
+
+        Args:
+            key (Hashable): The key.
+            expires_at (datetime): When the key expires.
+        """
+        with self._lock:
+            self.expiries[key] = expires_at
+            heapq.heappush(self._heap, (expires_at, key))
+            if len(self._heap) > 2 * len(self.expiries) + 64:
+                self._compact()
+
+    def discard(self, key: Hashable):
+        """
+        Stop tracking a key.
+
+        Args:
+            key (Hashable): The key.
+        """
+        with self._lock:
+            self.expiries.pop(key, None)
+
+    def pop_expired(self, now: datetime, limit: int = None) -> List[Hashable]:
+        """
+        Remove and return the keys expired at a given time, soonest first.
+
+        Args:
+            now (datetime): The current time.
+            limit (int): Maximum number of keys returned.
+
+        Returns:
+            list: The expired keys.
+        """
+        expired = []
+        with self._lock:
+            heap = self._heap
+            while heap and heap[0][0] <= now:
+                if limit is not None and len(expired) >= limit:
+                    break
+                expires_at, key = heapq.heappop(heap)
+                if self.expiries.get(key) == expires_at:
+                    del self.expiries[key]
+                    expired.append(key)
+        return expired
+
+    def _compact(self):
+        """Rebuild the heap without its stale entries, lock held."""
+        self._heap = [(exp, key) for key, exp in self.expiries.items()]
+        heapq.heapify(self._heap)
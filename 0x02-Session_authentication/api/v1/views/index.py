@@ -1,6 +1,6 @@
 #!/usr/bin/env python3
 """Index module for the API."""
-from flask import jsonify, abort
+from flask import current_app, jsonify, abort
 from api.v1.views import app_views
 
 
@@ -39,6 +39,13 @@ def stats() -> str:
     """
     from models.user import User
 
+    auth = current_app.extensions.get("auth")
     stats = {}
     stats["users"] = User.count()
+    if getattr(auth, "credentials_cache", None) is not None:
+        stats["credentials_cache"] = auth.credentials_cache.stats()
+    if hasattr(auth, "session_store"):
+        stats["session_store"] = auth.session_store.stats()
+    if hasattr(auth, "sweep_stats"):
+        stats["session_sweeps"] = auth.sweep_stats
     return jsonify(stats)
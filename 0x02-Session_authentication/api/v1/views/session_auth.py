@@ -2,7 +2,7 @@
 """ Module of Users views
 """
 from api.v1.views import app_views
-from flask import abort, jsonify, request
+from flask import abort, current_app, jsonify, request
 from models.user import User
 from os import getenv
 
@@ -26,8 +26,7 @@ def login_session() -> str:
     if not user.is_valid_password(password):
         return jsonify({"error": "wrong password"}), 401
 
-    from api.v1.app import auth
-
+    auth = current_app.extensions["auth"]
     session_id = auth.create_session(user.id)
     response = jsonify(user.to_json())
     response.set_cookie(getenv("SESSION_NAME"), session_id)
@@ -42,8 +41,7 @@ def logout_session():
     Return:
       - Empty dict upon successful session destruction
     """
-    from api.v1.app import auth
-
+    auth = current_app.extensions["auth"]
     if not auth.destroy_session(request):
         abort(404)
     return jsonify({}), 200
@@ -0,0 +1,40 @@
+#!/usr/bin/env python3
+""" Main 10
+"""
+import os
+import sys
+import tracemalloc
+import uuid
+from datetime import datetime
+
+count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+os.environ["SESSION_DURATION"] = "3600"
+os.environ["SESSION_SWEEP_INTERVAL"] = "0"
+os.environ["SESSION_CACHE_SIZE"] = str(count // 2)
+from api.v1.auth.session_exp_auth import SessionExpAuth  # noqa: E402
+
+session_ids = [str(uuid.uuid4()) for i in range(count)]
+user_ids = [str(uuid.uuid4()) for i in range(count)]
+
+""" Previous storage: nested dict and datetime per session """
+tracemalloc.start()
+sessions = {}
+for session_id, user_id in zip(session_ids, user_ids):
+    sessions[session_id] = {"user_id": user_id, "created_at": datetime.now()}
+size = tracemalloc.get_traced_memory()[0]
+tracemalloc.stop()
+print("dict:          {:.0f} bytes per session".format(size / count))
+del sessions
+
+tracemalloc.start()
+auth = SessionExpAuth()
+cache = auth.session_store.cache
+for session_id, user_id in zip(session_ids, user_ids):
+    cache.set(session_id, user_id, ttl=auth.session_duration)
+size = tracemalloc.get_traced_memory()[0]
+tracemalloc.stop()
+print("session cache: {:.0f} bytes per session".format(size / len(cache)))
+
+for session_id in session_ids:
+    auth.user_id_for_session_id(session_id)
+print(cache.stats())
@@ -0,0 +1,44 @@
+#!/usr/bin/env python3
+""" Main 11
+"""
+import os
+import sys
+import time
+from api.v1.auth.resp_server import RESPServer
+
+count = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+
+server = RESPServer().start()
+os.environ["SESSION_STORE"] = "redis"
+os.environ["SESSION_STORE_URL"] = server.url
+os.environ["SESSION_DURATION"] = "1"
+os.environ["SESSION_SWEEP_INTERVAL"] = "0"
+from api.v1.auth.session_exp_auth import SessionExpAuth  # noqa: E402
+
+""" Two workers sharing the store """
+worker_1 = SessionExpAuth()
+worker_2 = SessionExpAuth()
+session_id = worker_1.create_session("user-1")
+print("worker 2 sees:", worker_2.user_id_for_session_id(session_id))
+time.sleep(1.5)
+print("after expiry:", worker_2.user_id_for_session_id(session_id))
+
+store = worker_1.session_store
+session_ids = ["session-{}".format(i) for i in range(count)]
+with store.client.pipeline() as pipe:
+    for session_id in session_ids:
+        pipe.set(store.prefix + session_id, session_id)
+    pipe.execute()
+
+start = time.perf_counter()
+for session_id in session_ids:
+    store.get(session_id)
+elapsed = time.perf_counter() - start
+print("{} lookups, one round trip each: {:.3f}s".format(count, elapsed))
+
+start = time.perf_counter()
+found = store.get_many(session_ids)
+elapsed = time.perf_counter() - start
+print("{} lookups, pipelined:           {:.3f}s".format(len(found), elapsed))
+print(store.stats())
+server.stop()
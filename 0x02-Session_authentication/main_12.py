@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+""" Main 12
+"""
+import base64
+import os
+import sys
+import tempfile
+import time
+
+# Run in a scratch directory so the committed .db_*.json stay untouched
+workdir = tempfile.TemporaryDirectory()
+os.chdir(workdir.name)
+os.environ["SESSION_NAME"] = "_my_session_id"
+os.environ["SESSION_DURATION"] = "3600"
+os.environ["SESSION_SWEEP_INTERVAL"] = "0"
+from flask import Flask  # noqa: E402
+from api.v1.auth.basic_auth import BasicAuth  # noqa: E402
+from api.v1.auth.session_auth import SessionAuth  # noqa: E402
+from api.v1.auth.session_db_auth import SessionDBAuth  # noqa: E402
+from api.v1.auth.session_exp_auth import SessionExpAuth  # noqa: E402
+from models.base import batch_writes  # noqa: E402
+from models.user import User  # noqa: E402
+
+count = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+requests = 200
+
+User.load_from_file()
+with batch_writes():
+    for i in range(count):
+        user = User()
+        user.email = "user{}@hbtn.io".format(i)
+        user.password = "pwd{}".format(i)
+        user.save()
+app = Flask(__name__)
+
+for auth_type, auth in [
+    ("basic_auth", BasicAuth()),
+    ("session_auth", SessionAuth()),
+    ("session_exp_auth", SessionExpAuth()),
+    ("session_db_auth", SessionDBAuth()),
+]:
+    if isinstance(auth, BasicAuth):
+        credentials = "{}:{}".format(user.email, "pwd{}".format(count - 1))
+        header = "Basic " + base64.b64encode(credentials.encode()).decode()
+        context = {"headers": {"Authorization": header}}
+    else:
+        session_id = auth.create_session(user.id)
+        context = {"headers": {
+            "Cookie": "_my_session_id={}".format(session_id)
+        }}
+    """ Previous hook resolved the user twice, now memoized per request """
+    resolve = type(auth).current_user.__wrapped__
+
+    for label, current_user in [
+        ("twice", lambda request: resolve(auth, request)),
+        ("once ", auth.current_user),
+    ]:
+        elapsed = 0
+        for i in range(requests):
+            with app.test_request_context(**context) as ctx:
+                start = time.perf_counter()
+                assert current_user(ctx.request) is not None
+                assert current_user(ctx.request) is not None
+                elapsed += time.perf_counter() - start
+        elapsed /= requests
+        print("{:<17} {}: {:.6f}s per request".format(
+            auth_type, label, elapsed))
@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+""" Main 13
+"""
+import base64
+import os
+import sys
+import tempfile
+import time
+from flask import Flask
+
+# Run in a scratch directory so the committed .db_*.json stay untouched
+workdir = tempfile.TemporaryDirectory()
+os.chdir(workdir.name)
+from api.v1.auth.basic_auth import BasicAuth  # noqa: E402
+from models.base import batch_writes  # noqa: E402
+from models.user import User  # noqa: E402
+
+count = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+requests = 10000
+
+User.load_from_file()
+with batch_writes():
+    for i in range(count):
+        user = User()
+        user.email = "user{}@hbtn.io".format(i)
+        user.password = "pwd{}".format(i)
+        user.save()
+app = Flask(__name__)
+auth = BasicAuth()
+credentials = "{}:pwd{}".format(user.email, count - 1).encode()
+header = "Basic " + base64.b64encode(credentials).decode()
+
+
+def resolve(current_user) -> float:
+    """ Seconds per user resolution, a new request each time """
+    elapsed = 0
+    for i in range(requests):
+        with app.test_request_context(
+            headers={"Authorization": header}
+        ) as ctx:
+            start = time.perf_counter()
+            assert current_user(ctx.request) is not None
+            elapsed += time.perf_counter() - start
+    return elapsed / requests
+
+
+def verify(request):
+    """ Previous resolution: decode and verify the header every time """
+    auth_header = auth.authorization_header(request)
+    extracted = auth.extract_base64_authorization_header(auth_header)
+    decoded = auth.decode_base64_authorization_header(extracted)
+    email, password = auth.extract_user_credentials(decoded)
+    return auth.user_object_from_credentials(email, password)
+
+
+print("verified:  {:.6f}s per request".format(resolve(verify)))
+print("cached:    {:.6f}s per request".format(resolve(auth.current_user)))
+print(auth.credentials_cache.stats())
+
+user.password = "new password"
+user.save()
+with app.test_request_context(headers={"Authorization": header}) as ctx:
+    print("after password change:", auth.current_user(ctx.request))
@@ -0,0 +1,41 @@
+#!/usr/bin/env python3
+""" Main 14
+"""
+import sys
+import time
+from fnmatch import fnmatch
+from api.v1.auth.auth import Auth
+
+count = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+checks = 10000
+
+excluded_paths = tuple(
+    ["/api/v1/status/", "/api/v1/unauthorized/", "/api/v1/forbidden/"] +
+    ["/api/v1/public/{}/".format(i) for i in range(count)] +
+    ["/api/v1/static/{}/*".format(i) for i in range(count)] +
+    ["/api/v1/files/*/{}/".format(i) for i in range(count)]
+)
+paths = ["/api/v1/users", "/api/v1/static/7/app.js", "/api/v1/status"]
+auth = Auth()
+
+
+def require_auth(path, excluded_paths):
+    """ Previous require_auth: fnmatch every pattern """
+    if path[-1] != "/":
+        path += "/"
+    return not [n for n in excluded_paths if fnmatch(path, n)]
+
+
+for path in paths:
+    assert auth.require_auth(path, excluded_paths) == \
+        require_auth(path, excluded_paths)
+for label, check in [
+    ("fnmatch", require_auth), ("matcher", auth.require_auth)
+]:
+    start = time.perf_counter()
+    for i in range(checks):
+        for path in paths:
+            check(path, excluded_paths)
+    elapsed = (time.perf_counter() - start) / (checks * len(paths))
+    print("{}: {:.7f}s per path, {} patterns".format(
+        label, elapsed, len(excluded_paths)))
@@ -0,0 +1,24 @@
+#!/usr/bin/env python3
+""" Main 15
+"""
+import os
+import subprocess
+import sys
+
+script = """
+import sys, time
+start = time.perf_counter()
+from api.v1.app import auth
+elapsed = time.perf_counter() - start
+modules = sorted(m[12:] for m in sys.modules if m.startswith("api.v1.auth."))
+print("{:.3f}s".format(elapsed), type(auth).__name__, ", ".join(modules))
+"""
+for auth_type in [
+    "basic_auth", "session_auth", "session_db_auth", "session_auth,basic_auth"
+]:
+    env = dict(os.environ, AUTH_TYPE=auth_type)
+    out = subprocess.run(
+        [sys.executable, "-c", script], env=env, capture_output=True,
+        text=True
+    )
+    print("{}: {}".format(auth_type, (out.stdout or out.stderr).strip()))
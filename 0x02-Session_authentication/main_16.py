@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+""" Main 16
+"""
+import os
+import sys
+import tempfile
+import time
+
+# Run in a scratch directory so the committed .db_*.json stay untouched
+workdir = tempfile.TemporaryDirectory()
+os.chdir(workdir.name)
+from models.base import batch_writes  # noqa: E402
+from models.user import User  # noqa: E402
+
+count = int(sys.argv[1]) if len(sys.argv) > 1 else 50000
+
+User.load_from_file()
+if User.count() < count:
+    with batch_writes():
+        for i in range(User.count(), count):
+            user = User()
+            user.email = "user{}@hbtn.io".format(i)
+            user.password = "pwd"
+            user.save()
+
+from api.v1.app import app  # noqa
+
+client = app.test_client()
+for label, url in [
+    ("full list", "/api/v1/users"),
+    ("full list, fields", "/api/v1/users?fields=id,email"),
+    ("first page", "/api/v1/users?limit=100"),
+    ("page, fields", "/api/v1/users?limit=100&fields=id,email"),
+]:
+    start = time.perf_counter()
+    response = client.get(url)
+    elapsed = time.perf_counter() - start
+    print("{}: {:.4f}s, {} bytes".format(
+        label, elapsed, len(response.data)))
+
+start = time.perf_counter()
+pages, cursor = 0, None
+while True:
+    url = "/api/v1/users?limit=1000&fields=id"
+    if cursor:
+        url += "&cursor=" + cursor
+    cursor = client.get(url).json["next_cursor"]
+    pages += 1
+    if cursor is None:
+        break
+print("walk {} users in {} pages: {:.4f}s".format(
+    User.count(), pages, time.perf_counter() - start))
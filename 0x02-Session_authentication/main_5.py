@@ -0,0 +1,26 @@
+#!/usr/bin/env python3
+""" Main 5
+"""
+import os
+import sys
+import tempfile
+import time
+
+# Run in a scratch directory so the committed .db_*.json stay untouched
+workdir = tempfile.TemporaryDirectory()
+os.chdir(workdir.name)
+from models.base import batch_writes  # noqa: E402
+from models.user import User  # noqa: E402
+
+count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+
+User.load_from_file()
+start = time.perf_counter()
+with batch_writes(flush_every=10000):
+    for i in range(count):
+        user = User()
+        user.email = "bulk{}@hbtn.io".format(i)
+        user.password = "pwd{}".format(i)
+        user.save()
+elapsed = time.perf_counter() - start
+print("{} users imported in {:.2f}s".format(count, elapsed))
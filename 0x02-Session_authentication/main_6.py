@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+""" Main 6
+"""
+import json
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+# Run in a scratch directory so the committed .db_*.json stay untouched
+workdir = tempfile.TemporaryDirectory()
+os.chdir(workdir.name)
+from models.base import TIMESTAMP_FORMAT  # noqa: E402
+from models.user import User  # noqa: E402
+
+count = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+
+""" Write a users file """
+now = datetime.utcnow().strftime(TIMESTAMP_FORMAT)
+users = {}
+for i in range(count):
+    user_id = "user-{}".format(i)
+    users[user_id] = {
+        "id": user_id, "created_at": now, "updated_at": now,
+        "email": "user{}@hbtn.io".format(i), "_password": None,
+        "first_name": None, "last_name": None,
+    }
+with open(".db_User.json", "w") as f:
+    f.write(json.dumps(users))
+del users
+
+""" Previous load: build every object with strptime """
+start = time.perf_counter()
+with open(".db_User.json", "r") as f:
+    eager = {}
+    for obj_id, obj_json in json.load(f).items():
+        obj = User(**dict(obj_json, created_at=None, updated_at=None))
+        obj.created_at = datetime.strptime(now, TIMESTAMP_FORMAT)
+        obj.updated_at = datetime.strptime(now, TIMESTAMP_FORMAT)
+        eager[obj_id] = obj
+print("eager load:   {:.2f}s".format(time.perf_counter() - start))
+del eager
+
+start = time.perf_counter()
+User.load_from_file()
+print("lazy load:    {:.2f}s".format(time.perf_counter() - start))
+
+start = time.perf_counter()
+user = User.search({"email": "user{}@hbtn.io".format(count // 2)})[0]
+elapsed = time.perf_counter() - start
+print("first search: {:.6f}s ({})".format(elapsed, user.id))
+
+start = time.perf_counter()
+User.all()
+print("materialize:  {:.2f}s".format(time.perf_counter() - start))
@@ -0,0 +1,41 @@
+#!/usr/bin/env python3
+""" Main 7
+"""
+import os
+import sys
+import tempfile
+import time
+from multiprocessing import Process
+
+# Run in a scratch directory so the committed .db_*.json stay untouched
+workdir = tempfile.TemporaryDirectory()
+os.chdir(workdir.name)
+os.environ.setdefault("MODELS_STORAGE", "shared")
+from models.user import User  # noqa: E402
+
+writers = int(sys.argv[1]) if len(sys.argv) > 1 else 8
+count = int(sys.argv[2]) if len(sys.argv) > 2 else 500
+
+
+def write_users(writer: int):
+    """ Create users, reading the store between writes """
+    for i in range(count):
+        user = User()
+        user.email = "writer{}-{}@hbtn.io".format(writer, i)
+        user.save()
+        User.count()
+
+
+start = time.perf_counter()
+processes = [Process(target=write_users, args=(w,)) for w in range(writers)]
+for process in processes:
+    process.start()
+for process in processes:
+    process.join()
+elapsed = time.perf_counter() - start
+
+User.load_from_file()
+expected = writers * count
+print("{} writers saved {} users in {:.2f}s ({} storage)".format(
+    writers, expected, elapsed, os.environ["MODELS_STORAGE"]))
+print("{} users stored, {} lost".format(User.count(), expected - User.count()))
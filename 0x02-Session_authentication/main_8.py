@@ -0,0 +1,39 @@
+#!/usr/bin/env python3
+""" Main 8
+"""
+import os
+import sys
+import tempfile
+import time
+
+# Run in a scratch directory so the committed .db_*.json stay untouched
+workdir = tempfile.TemporaryDirectory()
+os.chdir(workdir.name)
+from api.v1.auth.session_db_auth import SessionDBAuth  # noqa: E402
+from models.base import batch_writes  # noqa: E402
+from models.user_session import UserSession  # noqa: E402
+
+count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+lookups = 1000
+
+UserSession.load_from_file()
+with batch_writes():
+    for i in range(count):
+        UserSession(user_id="user-{}".format(i),
+                    session_id="session-{}".format(i)).save()
+auth = SessionDBAuth()
+auth.session_duration = 3600
+session_id = "session-{}".format(count // 2)
+
+start = time.perf_counter()
+for i in range(10):
+    UserSession.load_from_file()
+    UserSession.search({"session_id": session_id})
+elapsed = (time.perf_counter() - start) / 10
+print("full reload:  {:.6f}s per lookup".format(elapsed))
+
+start = time.perf_counter()
+for i in range(lookups):
+    user_id = auth.user_id_for_session_id(session_id)
+elapsed = (time.perf_counter() - start) / lookups
+print("refresh:      {:.6f}s per lookup ({})".format(elapsed, user_id))
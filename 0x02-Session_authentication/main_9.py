@@ -0,0 +1,34 @@
+#!/usr/bin/env python3
+""" Main 9
+"""
+import os
+import sys
+import tempfile
+import time
+
+# Run in a scratch directory so the committed .db_*.json stay untouched
+workdir = tempfile.TemporaryDirectory()
+os.chdir(workdir.name)
+os.environ["SESSION_DURATION"] = "5"
+os.environ["SESSION_SWEEP_INTERVAL"] = "0"
+from api.v1.auth.session_db_auth import SessionDBAuth  # noqa: E402
+from models.base import batch_writes  # noqa: E402
+from models.user_session import UserSession  # noqa: E402
+
+count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+
+auth = SessionDBAuth()
+with batch_writes():
+    for i in range(count):
+        auth.create_session("user-{}".format(i))
+print("{} sessions, {} tracked".format(
+    UserSession.count(), len(auth.session_store.expiry_index)))
+
+time.sleep(6)
+session_id = auth.create_session("user-live")
+print("swept {} sessions".format(auth.sweep()))
+print(auth.sweep_stats)
+# The live session must survive the sweep, however long the sweep took
+live = UserSession.search({"session_id": session_id})
+print("{} sessions left, live session kept: {}".format(
+    UserSession.count(), [s.user_id for s in live] == ["user-live"]))
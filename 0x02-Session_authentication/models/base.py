@@ -1,37 +1,54 @@
 #!/usr/bin/env python3
 """ Base module
 """
+from contextlib import contextmanager
 from datetime import datetime
-from typing import TypeVar, List, Iterable
-from os import path
-import json
+from typing import TypeVar, List, Iterable, Iterator
+from os import getenv
 import uuid
+from models.engine import load_engine
+from models.engine.storage import WriteBatch
 
 
 TIMESTAMP_FORMAT = "%Y-%m-%dT%H:%M:%S"
-DATA = {}
+# Storage engine of the objects, see models.engine.ENGINES: "file"
+# rewrites .db_<Class>.json on every write, "journal" appends each write
+# to .db_<Class>.journal and compacts it into .db_<Class>.json, "shared"
+# is a journal several processes can write to, "sqlite" keeps one table
+# per class in the MODELS_SQLITE_PATH database
+STORAGE = getenv("MODELS_STORAGE", "file")
+
+
+def _parse_timestamp(value: str) -> datetime:
+    """Parse a TIMESTAMP_FORMAT string, with fromisoformat that reads
+    this fixed format far faster than strptime"""
+    return datetime.fromisoformat(value)
+
+
+def _format_timestamp(value: datetime) -> str:
+    """Format a datetime as a TIMESTAMP_FORMAT string"""
+    if value.tzinfo is None:
+        return value.isoformat(timespec="seconds")
+    return value.strftime(TIMESTAMP_FORMAT)
 
 
 class Base:
     """Base class"""
 
+    # Attributes indexed by the storage engine and used by search()
+    INDEXED_ATTRIBUTES = ()
+
     def __init__(self, *args: list, **kwargs: dict):
         """Initialize a Base instance"""
-        s_class = str(self.__class__.__name__)
-        if DATA.get(s_class) is None:
-            DATA[s_class] = {}
+        storage.register(self.__class__)
 
         self.id = kwargs.get("id", str(uuid.uuid4()))
         if kwargs.get("created_at") is not None:
-            self.created_at = datetime.strptime(
-                kwargs.get("created_at"), TIMESTAMP_FORMAT
-            )
+            self.created_at = _parse_timestamp(kwargs.get("created_at"))
         else:
             self.created_at = datetime.utcnow()
         if kwargs.get("updated_at") is not None:
-            self.updated_at = datetime.strptime(
-                kwargs.get("updated_at"), TIMESTAMP_FORMAT
-            )
+            self.updated_at = _parse_timestamp(kwargs.get("updated_at"))
         else:
             self.updated_at = datetime.utcnow()
 
@@ -43,88 +60,99 @@ class Base:
             return False
         return self.id == other.id
 
-    def to_json(self, for_serialization: bool = False) -> dict:
-        """Convert the object a JSON dictionary"""
+    def to_json(
+        self, for_serialization: bool = False, fields: Iterable[str] = None
+    ) -> dict:
+        """Convert the object a JSON dictionary, limited to the given
+        attributes if fields is not None"""
         result = {}
-        for key, value in self.__dict__.items():
+        items = self.__dict__.items()
+        if fields is not None:
+            items = [(k, self.__dict__[k]) for k in fields
+                     if k in self.__dict__]
+        for key, value in items:
             if not for_serialization and key[0] == "_":
                 continue
             if type(value) is datetime:
-                result[key] = value.strftime(TIMESTAMP_FORMAT)
+                result[key] = _format_timestamp(value)
             else:
                 result[key] = value
         return result
 
+    def page_key(self) -> tuple:
+        """Position of the object in pages: (created_at, id), stable as
+        neither changes once the object is created"""
+        return _format_timestamp(self.created_at), self.id
+
     @classmethod
     def load_from_file(cls):
-        """Load all objects from file"""
-        s_class = cls.__name__
-        file_path = ".db_{}.json".format(s_class)
-        DATA[s_class] = {}
-        if not path.exists(file_path):
-            return
-
-        with open(file_path, "r") as f:
-            objs_json = json.load(f)
-            for obj_id, obj_json in objs_json.items():
-                DATA[s_class][obj_id] = cls(**obj_json)
+        """Load all objects from storage"""
+        storage.load(cls)
 
     @classmethod
-    def save_to_file(cls):
-        """Save all objects to file"""
-        s_class = cls.__name__
-        file_path = ".db_{}.json".format(s_class)
-        objs_json = {}
-        for obj_id, obj in DATA[s_class].items():
-            objs_json[obj_id] = obj.to_json(True)
+    def refresh(cls):
+        """Reload what changed in storage since the objects were loaded"""
+        storage.refresh(cls)
 
-        with open(file_path, "w") as f:
-            json.dump(objs_json, f)
+    @classmethod
+    def save_to_file(cls):
+        """Save all objects to storage"""
+        storage.save_all(cls)
 
     def save(self):
         """Save current object"""
-        s_class = self.__class__.__name__
         self.updated_at = datetime.utcnow()
-        DATA[s_class][self.id] = self
-        self.__class__.save_to_file()
+        storage.save(self)
 
     def remove(self):
         """Remove object"""
-        s_class = self.__class__.__name__
-        if DATA[s_class].get(self.id) is not None:
-            del DATA[s_class][self.id]
-            self.__class__.save_to_file()
+        storage.remove(self)
 
     @classmethod
     def count(cls) -> int:
         """Count all objects"""
-        s_class = cls.__name__
-        return len(DATA[s_class].keys())
+        return storage.count(cls)
 
     @classmethod
     def all(cls) -> Iterable[TypeVar("Base")]:  # type: ignore
         """Return all objects"""
-        return cls.search()
+        return storage.all(cls)
 
     @classmethod
     def get(cls, id: str) -> TypeVar("Base"):  # type: ignore
         """Return one object by ID"""
-        s_class = cls.__name__
-        return DATA[s_class].get(id)
+        return storage.get(cls, id)
 
     @classmethod
     def search(
         cls, attributes: dict = {}
     ) -> List[TypeVar("Base")]:  # type: ignore
         """Search all objects with matching attributes"""
-        s_class = cls.__name__
+        return storage.search(cls, attributes)
+
+    @classmethod
+    def page(
+        cls, after: tuple = None, limit: int = 100
+    ) -> List[TypeVar("Base")]:  # type: ignore
+        """Return at most limit objects ordered by page_key(), starting
+        after the object of page_key() after, from the start if None"""
+        return storage.page(cls, after, limit)
+
+
+@contextmanager
+def batch_writes(
+    flush_every: int = 0, interval: float = 0
+) -> Iterator[WriteBatch]:
+    """Defer the persistence of save() and remove() until the end of the
+    block, so each dirty class is written once instead of on every write.
+
+    flush_every persists after that many writes and interval persists
+    every interval seconds from a background thread, to bound what a
+    crash in the block loses. Nested blocks join the outer batch. Only
+    the writes of the calling thread are deferred.
+    """
+    with storage.batch_writes(flush_every, interval) as batch:
+        yield batch
 
-        def _search(obj):
-            if len(attributes) == 0:
-                return True
-            for k, v in attributes.items():
-                if getattr(obj, k) != v:
-                    return False
-            return True
 
-        return list(filter(_search, DATA[s_class].values()))
+storage = load_engine(STORAGE)
@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+""" SQLiteStorage module
+"""
+from datetime import datetime
+from typing import TypeVar, List
+from os import getenv
+import json
+import sqlite3
+from models.engine.storage import Storage
+
+
+# Database file of the sqlite engine
+SQLITE_PATH = getenv("MODELS_SQLITE_PATH", ".db_models.sqlite3")
+
+
+def _column(attr: str) -> str:
+    """SQL expression of an attribute in the JSON of an object"""
+    return "json_extract(data, '$.{}')".format(attr)
+
+
+class SQLiteStorage(Storage):
+    """Keeps the objects in a SQLite database, one table per class
+
+    Each row holds the JSON of an object; the INDEXED_ATTRIBUTES of the
+    class get an index on their JSON value, so search() on them is an
+    index lookup, and an index on (created_at, id) serves page(). Writes
+    are committed right away, or once per flush while writes are batched.
+    """
+
+    def __init__(self, db_path: str = None):
+        """Initialize a SQLiteStorage instance"""
+        super().__init__()
+        self.db_path = db_path or SQLITE_PATH
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._tables = set()
+
+    def _table(self, cls: type) -> str:
+        """Name of the table of the class, created on first use"""
+        table = cls.__name__
+        if table in self._tables:
+            return table
+        with self._lock:
+            self._conn.execute(
+                'CREATE TABLE IF NOT EXISTS "{}" '
+                '(id TEXT PRIMARY KEY, data TEXT NOT NULL)'.format(table)
+            )
+            for attr in cls.INDEXED_ATTRIBUTES:
+                self._conn.execute(
+                    'CREATE INDEX IF NOT EXISTS "{0}_{1}" ON "{0}" ({2})'
+                    .format(table, attr, _column(attr))
+                )
+            self._conn.execute(
+                'CREATE INDEX IF NOT EXISTS "{0}__page" ON "{0}" ({1}, id)'
+                .format(table, _column("created_at"))
+            )
+            self._conn.commit()
+            self._tables.add(table)
+        return table
+
+    def _query(self, sql: str, params: tuple = ()) -> list:
+        """Run a query, returning all rows"""
+        with self._lock:
+            return self._conn.execute(sql, params).fetchall()
+
+    def load(self, cls: type):
+        """Nothing to load, the objects are read from the database on
+        every call"""
+        self._table(cls)
+
+    def save_all(self, cls: type):
+        """Commit the pending writes"""
+        with self._lock:
+            self._conn.commit()
+
+    def _write(self, cls: type, writes: List[tuple]):
+        """Commit the writes, already executed by save() and remove()"""
+        with self._lock:
+            self._conn.commit()
+
+    def save(self, obj: TypeVar("Base")):  # type: ignore
+        """Save an object"""
+        cls = obj.__class__
+        table = self._table(cls)
+        with self._lock:
+            self._conn.execute(
+                'INSERT INTO "{}" (id, data) VALUES (?, ?) '
+                'ON CONFLICT(id) DO UPDATE SET data = excluded.data'
+                .format(table),
+                (obj.id, json.dumps(obj.to_json(True))),
+            )
+        self._persist(cls, "save", obj)
+
+    def remove(self, obj: TypeVar("Base")):  # type: ignore
+        """Remove an object"""
+        cls = obj.__class__
+        table = self._table(cls)
+        with self._lock:
+            cursor = self._conn.execute(
+                'DELETE FROM "{}" WHERE id = ?'.format(table), (obj.id,)
+            )
+        if cursor.rowcount:
+            self._persist(cls, "remove", obj)
+
+    def count(self, cls: type) -> int:
+        """Count all objects of the class"""
+        table = self._table(cls)
+        return self._query('SELECT COUNT(*) FROM "{}"'.format(table))[0][0]
+
+    def get(self, cls: type, id: str) -> TypeVar("Base"):  # type: ignore
+        """Return one object by ID"""
+        table = self._table(cls)
+        rows = self._query(
+            'SELECT data FROM "{}" WHERE id = ?'.format(table), (id,)
+        )
+        if not rows:
+            return None
+        return cls(**json.loads(rows[0][0]))
+
+    def search(
+        self, cls: type, attributes: dict = {}
+    ) -> List[TypeVar("Base")]:  # type: ignore
+        """Search all objects with matching attributes
+
+        Attributes stored in the JSON of the objects are matched in SQL,
+        the others (properties, values with no JSON equivalent) are
+        compared on the objects returned.
+        """
+        from models.base import _format_timestamp
+
+        table = self._table(cls)
+        clauses, params, others = [], [], {}
+        for k, v in attributes.items():
+            value = _format_timestamp(v) if type(v) is datetime else v
+            if not k.isidentifier() or \
+                    isinstance(getattr(cls, k, None), property) or \
+                    not (value is None or type(value) in (str, int, float)):
+                others[k] = v
+            elif value is None:
+                clauses.append("{} IS NULL".format(_column(k)))
+            else:
+                clauses.append("{} = ?".format(_column(k)))
+                params.append(value)
+
+        sql = 'SELECT data FROM "{}"'.format(table)
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += " ORDER BY rowid"
+        objs = [cls(**json.loads(row[0])) for row in self._query(sql, params)]
+        if not others:
+            return objs
+
+        def _search(obj):
+            for k, v in others.items():
+                if getattr(obj, k) != v:
+                    return False
+            return True
+
+        return list(filter(_search, objs))
+
+    def page(
+        self, cls: type, after: tuple = None, limit: int = 100
+    ) -> List[TypeVar("Base")]:  # type: ignore
+        """Return at most limit objects in page_key() order, after the
+        object of key after, read in order from the page index"""
+        table = self._table(cls)
+        created_at = _column("created_at")
+        sql = 'SELECT data FROM "{}"'.format(table)
+        params = []
+        if after:
+            # Not a (created_at, id) row value, which SQLite scans from
+            # the start of the index instead of seeking to the key
+            sql += " WHERE {0} >= ? AND ({0} > ? OR id > ?)".format(
+                created_at)
+            params.extend((after[0], after[0], after[1]))
+        sql += " ORDER BY {}, id LIMIT ?".format(created_at)
+        params.append(limit)
+        return [cls(**json.loads(row[0])) for row in self._query(sql, params)]
@@ -12,6 +12,8 @@ class UserSession(Base):
         session_id (str): The ID of the session.
     """
 
+    INDEXED_ATTRIBUTES = ("session_id", "user_id")
+
     def __init__(self, *args: list, **kwargs: dict):
         """Initialize a UserSession instance."""
         super().__init__(*args, **kwargs)
@@ -3,12 +3,13 @@
 """
 from flask import Flask, jsonify, request, make_response, redirect
 from auth import Auth
+from hasher import HashingService
 
 
 app = Flask(__name__)
 
 
-AUTH = Auth()
+AUTH = Auth(HashingService())
 
 
 @app.route("/")
@@ -3,6 +3,7 @@
 """
 import bcrypt
 from db import DB
+from hasher import HashingService
 from user import User
 from sqlalchemy.orm.exc import NoResultFound
 import uuid
@@ -23,9 +24,26 @@ def _generate_uuid() -> str:
 class Auth:
     """Auth class to interact with the authentication database."""
 
-    def __init__(self):
-        """Initialize the Auth class"""
+    def __init__(self, hasher: HashingService = None):
+        """Initialize the Auth class
+
+        With a hasher, bcrypt runs in its worker processes instead of
+        the calling thread.
+        """
         self._db = DB()
+        self._hasher = hasher
+
+    def _hash(self, password: str) -> bytes:
+        """Hash a password, with the hasher if there is one"""
+        if self._hasher is not None:
+            return self._hasher.hash(password)
+        return _hash_password(password)
+
+    def _check(self, password: str, hashed_password: bytes) -> bool:
+        """Check a password against a hash, with the hasher if any"""
+        if self._hasher is not None:
+            return self._hasher.check(password, hashed_password)
+        return bcrypt.checkpw(password.encode("utf-8"), hashed_password)
 
     def register_user(self, email: str, password: str) -> User:
         """Register a new user"""
@@ -33,7 +51,7 @@ class Auth:
             self._db.find_user_by(email=email)
             raise ValueError(f"User {email} already exists")
         except NoResultFound:
-            hashed_password = _hash_password(password)
+            hashed_password = self._hash(password)
             user = self._db.add_user(email, hashed_password)
             return user
 
@@ -41,9 +59,7 @@ class Auth:
         """Check if the provided email and password are valid"""
         try:
             user = self._db.find_user_by(email=email)
-            return bcrypt.checkpw(
-                password.encode("utf-8"), user.hashed_password
-            )
+            return self._check(password, user.hashed_password)
         except NoResultFound:
             return False
 
@@ -91,7 +107,7 @@ class Auth:
         """Update the user's password"""
         try:
             user = self._db.find_user_by(reset_token=reset_token)
-            hashed_password = _hash_password(password)
+            hashed_password = self._hash(password)
             user.hashed_password = hashed_password
             user.reset_token = None
             self._db.update_user(
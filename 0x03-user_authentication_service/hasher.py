@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""Hasher module
+"""
+from concurrent.futures import Future, ProcessPoolExecutor
+import os
+import threading
+import bcrypt
+
+
+def _hash(password: bytes) -> bytes:
+    """Hashes a password with a new salt, in a worker process"""
+    return bcrypt.hashpw(password, bcrypt.gensalt())
+
+
+def _check(password: bytes, hashed_password: bytes) -> bool:
+    """Checks a password against its hash, in a worker process"""
+    return bcrypt.checkpw(password, hashed_password)
+
+
+class HashingService:
+    """Runs bcrypt in a pool of worker processes, off the calling thread.
+
+    At most max_pending hashes are queued or running at once; submitting
+    more blocks the caller until a slot frees up.
+    """
+
+    def __init__(self, workers: int = None, max_pending: int = None) -> None:
+        """Initialize the HashingService class"""
+        self._workers = workers or os.cpu_count() or 1
+        self._pending = threading.BoundedSemaphore(
+            max_pending or 4 * self._workers
+        )
+        self._lock = threading.Lock()
+        self.__executor = None
+
+    @property
+    def _executor(self) -> ProcessPoolExecutor:
+        """Process pool, started on first use"""
+        with self._lock:
+            if self.__executor is None:
+                self.__executor = ProcessPoolExecutor(self._workers)
+            return self.__executor
+
+    def _submit(self, fn, *args) -> Future:
+        """Queue a call once a pending slot is free"""
+        self._pending.acquire()
+        try:
+            future = self._executor.submit(fn, *args)
+        except BaseException:
+            self._pending.release()
+            raise
+        future.add_done_callback(lambda _: self._pending.release())
+        return future
+
+    def submit_hash(self, password: str) -> Future:
+        """Hash a password, returning a future of the hash"""
+        return self._submit(_hash, password.encode("utf-8"))
+
+    def submit_check(self, password: str, hashed_password: bytes) -> Future:
+        """Check a password against a hash, returning a future of the result"""
+        return self._submit(_check, password.encode("utf-8"), hashed_password)
+
+    def hash(self, password: str) -> bytes:
+        """Hash a password, waiting for the result"""
+        return self.submit_hash(password).result()
+
+    def check(self, password: str, hashed_password: bytes) -> bool:
+        """Check a password against a hash, waiting for the result"""
+        return self.submit_check(password, hashed_password).result()
+
+    def shutdown(self) -> None:
+        """Stop the worker processes"""
+        with self._lock:
+            if self.__executor is not None:
+                self.__executor.shutdown()
+                self.__executor = None